@@ -0,0 +1,176 @@
+import atexit
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+
+# Record project and task creation in activity_log. Events are queued in memory and
+# written in batches by a background thread, so the write path never waits on an INSERT.
+ACTIVITY_LOG_ENABLED = os.environ.get("ACTIVITY_LOG_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Events held in memory at most; when the queue is full, writers wait (see below)
+ACTIVITY_LOG_QUEUE_SIZE = int(os.environ.get("ACTIVITY_LOG_QUEUE_SIZE", "10000"))
+
+# A batch is written once it has this many events or its oldest event is this many seconds old
+ACTIVITY_LOG_BATCH_SIZE = int(os.environ.get("ACTIVITY_LOG_BATCH_SIZE", "500"))
+ACTIVITY_LOG_FLUSH_INTERVAL = float(os.environ.get("ACTIVITY_LOG_FLUSH_INTERVAL", "1.0"))
+
+# Seconds a writer waits for queue space before its event is dropped and counted
+ACTIVITY_LOG_ENQUEUE_TIMEOUT = float(os.environ.get("ACTIVITY_LOG_ENQUEUE_TIMEOUT", "0.1"))
+
+# Seconds allowed at interpreter exit for the last events to be written
+ACTIVITY_LOG_SHUTDOWN_TIMEOUT = float(os.environ.get("ACTIVITY_LOG_SHUTDOWN_TIMEOUT", "10"))
+
+
+# Queued after the events a flush or stop must cover; the worker sets `done` once they are written
+class _Marker:
+    def __init__(self, stop=False):
+        self.stop = stop
+        self.done = threading.Event()
+
+
+# Buffered activity_log writer. record() only enqueues a (user_id, activity_type,
+# description, entity_type, entity_id, created_at) row stamped with the UTC time of the
+# call; a worker thread started on first use writes the rows with write_batch(rows)
+# (default: the configured storage backend's log_activities).
+class ActivityLogger:
+    def __init__(self, write_batch=None, queue_size=None, batch_size=None, flush_interval=None,
+                 enqueue_timeout=None, enabled=None):
+        self.enabled = ACTIVITY_LOG_ENABLED if enabled is None else enabled
+        self.batch_size = batch_size or ACTIVITY_LOG_BATCH_SIZE
+        self.flush_interval = ACTIVITY_LOG_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        self.enqueue_timeout = ACTIVITY_LOG_ENQUEUE_TIMEOUT if enqueue_timeout is None else enqueue_timeout
+
+        self._write_batch = write_batch
+        self._queue = queue.Queue(maxsize=queue_size or ACTIVITY_LOG_QUEUE_SIZE)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stopped = False
+        self._stats = {"recorded": 0, "written": 0, "dropped": 0, "failed": 0, "batches": 0}
+
+    # Queue one event; returns False when logging is off, stopped or the queue stayed full
+    def record(self, user_id, activity_type, description, entity_type, entity_id):
+        if not self.enabled or self._stopped:
+            return False
+        self._ensure_started()
+
+        try:
+            self._queue.put(
+                (user_id, activity_type, description, entity_type, entity_id, datetime.now(timezone.utc)),
+                timeout=self.enqueue_timeout,
+            )
+        except queue.Full:
+            with self._lock:
+                self._stats["dropped"] += 1
+                first_drop = self._stats["dropped"] == 1
+            if first_drop:
+                print("Activity log queue is full; dropping events (see the dropped count in the metrics)")
+            return False
+
+        with self._lock:
+            self._stats["recorded"] += 1
+        return True
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="activity-log-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.stop, ACTIVITY_LOG_SHUTDOWN_TIMEOUT)
+
+    # Block until every event queued so far is written; returns False on timeout
+    def flush(self, timeout=None):
+        if self._thread is None:
+            return True
+        marker = _Marker()
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.done.wait(timeout)
+
+    # Write what is queued and stop the worker; later events are not recorded
+    def stop(self, timeout=None):
+        with self._lock:
+            if self._stopped:
+                return True
+            self._stopped = True
+        if self._thread is None:
+            return True
+        marker = _Marker(stop=True)
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            print("Activity log writer did not drain its queue before shutdown")
+            return False
+        if not marker.done.wait(timeout):
+            print("Activity log writer did not finish writing before shutdown")
+            return False
+        return True
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["queued"] = self._queue.qsize()
+        return stats
+
+    def _run(self):
+        while True:
+            batch, marker = self._collect()
+            if batch:
+                self._write(batch)
+            if marker is not None:
+                marker.done.set()
+                if marker.stop:
+                    return
+
+    # Wait for the first event, then gather more until the batch is full, the flush
+    # interval has passed since the first one, or a flush/stop marker arrives
+    def _collect(self):
+        batch = []
+        deadline = None
+        while len(batch) < self.batch_size:
+            try:
+                if deadline is None:
+                    item = self._queue.get()
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+
+            if isinstance(item, _Marker):
+                return batch, item
+            batch.append(item)
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+        return batch, None
+
+    def _write(self, batch):
+        write_batch = self._write_batch
+        if write_batch is None:
+            from storage import get_storage
+            write_batch = self._write_batch = get_storage().log_activities
+
+        try:
+            success, message = write_batch(batch)
+        except Exception as e:
+            success, message = False, str(e)
+
+        with self._lock:
+            if success:
+                self._stats["written"] += len(batch)
+                self._stats["batches"] += 1
+            else:
+                self._stats["failed"] += len(batch)
+        if not success:
+            print(f"Error writing {len(batch)} activity log entries: {message}")
+
+
+# Shared writer used by the storage backends and the bulk importer
+activity_logger = ActivityLogger()
@@ -0,0 +1,344 @@
+# Headless Pareto analysis of one or many projects, for nightly reports and scripts.
+# Results are JSON records (one per project) written as JSON Lines or Parquet, or served
+# over a small JSON HTTP API. Neither gradio nor plotly is imported and no figure is built.
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from pareto import QUADRANT_LABELS, ParetoSummary, analyze_columns, name_tasks, summary_from_dict
+from recommendations import RECOMMENDATION_TOP_N, get_recommendations, recommendation_positions
+from storage import STORAGE_BACKEND, get_storage
+
+# Projects with more tasks than this are analyzed in the database (same setting as the app)
+SERVER_SIDE_ANALYSIS_THRESHOLD = int(os.environ.get("SERVER_SIDE_ANALYSIS_THRESHOLD", "5000"))
+
+# Worker processes analyzing projects (defaults to the CPU count)
+BATCH_WORKERS = int(os.environ.get("BATCH_WORKERS", "0")) or os.cpu_count() or 1
+
+# Projects handed to a worker at a time; larger chunks cut inter-process overhead
+BATCH_CHUNK_SIZE = int(os.environ.get("BATCH_CHUNK_SIZE", "8"))
+
+# Vital-few tasks listed per project record
+BATCH_TOP_TASKS = int(os.environ.get("BATCH_TOP_TASKS", "20"))
+
+# Records per Parquet row group
+PARQUET_ROW_GROUP_SIZE = int(os.environ.get("PARQUET_ROW_GROUP_SIZE", "1000"))
+
+# Address of the JSON API started by `batch_analysis.py --serve`
+BATCH_API_HOST = os.environ.get("BATCH_API_HOST", "127.0.0.1")
+BATCH_API_PORT = int(os.environ.get("BATCH_API_PORT", "7861"))
+
+
+# Analysis of one project, shaped for the server-side or in-memory path:
+# (ParetoResult or ParetoSummary or None, source). In-memory results only name the
+# tasks the record lists.
+def _project_analysis(storage, project_id, top_n, recommendations):
+    version = storage.get_task_version(project_id)
+    if not version or version[0] == 0:
+        return None, "empty"
+
+    if storage.server_side_analysis and version[0] > SERVER_SIDE_ANALYSIS_THRESHOLD:
+        from database import get_latest_snapshot, get_pareto_summary
+
+        # A current snapshot is reused; otherwise the summary is computed without storing it
+        snapshot = get_latest_snapshot(project_id)
+        if (snapshot is not None
+                and (snapshot['source_task_count'], snapshot['source_updated_at']) == tuple(version)
+                and "layer_counts" in snapshot['top_tasks']):
+            return summary_from_dict(snapshot['top_tasks']), "snapshot"
+        return get_pareto_summary(project_id, row_limit=max(top_n, RECOMMENDATION_TOP_N)), "summary"
+
+    columns = storage.get_task_columns(project_id)
+    if not len(columns[0]):
+        return None, "empty"
+    result = analyze_columns(columns, storage.get_project_weights(project_id))
+    positions = np.arange(min(top_n, result.cutoff))
+    if recommendations:
+        positions = np.concatenate([positions, recommendation_positions(result)])
+    return name_tasks(result, positions, lambda ids: storage.get_task_names(project_id, ids)), "tasks"
+
+
+# JSON-ready record of a project's analysis; failures are reported in "error", not raised
+def analyze_project(project_id, top_n=None, recommendations=False):
+    top_n = BATCH_TOP_TASKS if top_n is None else top_n
+    started = time.perf_counter()
+    record = {"project_id": project_id, "total_tasks": 0, "error": None}
+
+    try:
+        storage = get_storage()
+        result, source = _project_analysis(storage, project_id, top_n, recommendations)
+        record["source"] = source
+        record["weights"] = list(storage.get_project_weights(project_id) or ())
+        if result is not None:
+            record.update(_result_fields(result, top_n))
+            if recommendations:
+                record["recommendations"] = get_recommendations(result)
+    except Exception as e:
+        record["error"] = str(e)
+
+    record["elapsed_s"] = round(time.perf_counter() - started, 4)
+    return record
+
+
+def _result_fields(result, top_n):
+    if isinstance(result, ParetoSummary):
+        top, vital_count = result.top, result.vital_count
+    else:
+        top, vital_count = result, result.cutoff
+    shown = min(top_n, vital_count, len(top))
+    layer_counts = [int(count) for count in result.layer_counts]
+
+    return {
+        "total_tasks": int(result.total_tasks),
+        "vital_count": int(vital_count),
+        "vital_percentage": round(float(result.top_percentage), 4),
+        "total_score": round(float(result.total_score), 4),
+        "quadrant_counts": {label: int(count) for label, count in zip(QUADRANT_LABELS, result.quadrant_counts)},
+        "front_size": layer_counts[0] if layer_counts else None,
+        "layer_counts": layer_counts,
+        "top_tasks": [
+            {
+                "id": int(top.ids[i]),
+                "name": top.names[i],
+                "score": round(float(top.scores[i]), 4),
+                "quadrant": QUADRANT_LABELS[top.quadrants[i]],
+            }
+            for i in range(shown)
+        ],
+    }
+
+
+# Picklable per-project call for the worker processes
+class _ProjectTask:
+    def __init__(self, top_n, recommendations):
+        self.top_n = top_n
+        self.recommendations = recommendations
+
+    def __call__(self, project_id):
+        return analyze_project(project_id, self.top_n, self.recommendations)
+
+
+# Records of the given projects in project order, analyzed by `workers` processes.
+# Workers are spawned rather than forked so none inherits the parent's connection pool;
+# the in-memory backend has nothing to share across processes and runs in-process.
+def iter_project_records(project_ids, workers=None, top_n=None, recommendations=False, chunk_size=None):
+    project_ids = list(project_ids)
+    workers = min(workers or BATCH_WORKERS, len(project_ids))
+    task = _ProjectTask(top_n, recommendations)
+
+    if workers <= 1 or STORAGE_BACKEND.lower() == "memory":
+        for project_id in project_ids:
+            yield task(project_id)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        yield from executor.map(task, project_ids, chunksize=chunk_size or BATCH_CHUNK_SIZE)
+
+
+# Projects selected by explicit ids, by owner, or all of them
+def select_projects(project_ids=None, user_id=None, include_inactive=False):
+    if project_ids:
+        return list(project_ids)
+
+    storage = get_storage()
+    projects = storage.get_projects(user_id) if user_id is not None else storage.get_all_projects()
+    return [p["id"] for p in projects if include_inactive or p["is_active"]]
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def to_json(record):
+    return json.dumps(record, default=_json_default, ensure_ascii=False)
+
+
+# Write records as JSON Lines; returns (records, errors)
+def write_jsonl(records, out):
+    written = errors = 0
+    for record in records:
+        out.write(to_json(record) + "\n")
+        out.flush()
+        written += 1
+        errors += record["error"] is not None
+    return written, errors
+
+
+# Write records to a Parquet file in row groups of PARQUET_ROW_GROUP_SIZE; nested
+# fields (quadrant counts, layers, top tasks) are stored as JSON strings
+def write_parquet(records, path):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet output needs pyarrow: pip install pyarrow")
+
+    schema = pa.schema([
+        ("project_id", pa.int64()),
+        ("source", pa.string()),
+        ("total_tasks", pa.int64()),
+        ("vital_count", pa.int64()),
+        ("vital_percentage", pa.float64()),
+        ("total_score", pa.float64()),
+        ("front_size", pa.int64()),
+        ("weights", pa.list_(pa.float64())),
+        ("quadrant_counts", pa.string()),
+        ("layer_counts", pa.string()),
+        ("top_tasks", pa.string()),
+        ("recommendations", pa.string()),
+        ("elapsed_s", pa.float64()),
+        ("error", pa.string()),
+    ])
+    nested = ("quadrant_counts", "layer_counts", "top_tasks")
+
+    written = errors = 0
+    batch = []
+    with pq.ParquetWriter(path, schema) as writer:
+        for record in records:
+            row = {name: record.get(name) for name in schema.names}
+            for name in nested:
+                if row[name] is not None:
+                    row[name] = to_json(row[name])
+            batch.append(row)
+            written += 1
+            errors += record["error"] is not None
+            if len(batch) >= PARQUET_ROW_GROUP_SIZE:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+    return written, errors
+
+
+# JSON API:
+#   GET /projects/<id>                  one project's record (404 if it has no tasks)
+#   GET /analysis?project=1,2&user=3    records of the selected projects as application/x-ndjson
+class BatchAPIHandler(BaseHTTPRequestHandler):
+    workers = 1
+    recommendations = False
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        parts = [part for part in url.path.split("/") if part]
+
+        try:
+            top_n = int(query["top"][0]) if "top" in query else None
+            recommendations = query.get("recommendations", ["1" if self.recommendations else "0"])[0] in ("1", "true")
+
+            if len(parts) == 2 and parts[0] == "projects":
+                record = analyze_project(int(parts[1]), top_n, recommendations)
+                status = 404 if record.get("source") == "empty" else 500 if record["error"] else 200
+                self._send_json(status, record)
+            elif parts == ["analysis"]:
+                project_ids = [int(i) for value in query.get("project", []) for i in value.split(",") if i]
+                user_id = int(query["user"][0]) if "user" in query else None
+                if not project_ids and user_id is None:
+                    self._send_json(400, {"error": "Pass project=<ids> or user=<id>"})
+                    return
+                self._stream(iter_project_records(select_projects(project_ids, user_id), self.workers, top_n,
+                                                  recommendations))
+            else:
+                self._send_json(404, {"error": f"Unknown path {url.path}"})
+        except ValueError as e:
+            self._send_json(400, {"error": f"Invalid parameter: {e}"})
+
+    def _send_json(self, status, body):
+        payload = to_json(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    # One record per line as soon as it is ready; the response is chunk-encoded
+    def _stream(self, records):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for record in records:
+            line = (to_json(record) + "\n").encode("utf-8")
+            self.wfile.write(f"{len(line):x}\r\n".encode("ascii") + line + b"\r\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, format, *args):
+        print(f"{self.address_string()} - {format % args}", file=sys.stderr)
+
+
+def serve(host=None, port=None, workers=1, recommendations=False):
+    handler = type("Handler", (BatchAPIHandler,), {"workers": workers, "recommendations": recommendations})
+    server = ThreadingHTTPServer((host or BATCH_API_HOST, port or BATCH_API_PORT), handler)
+    print(f"Serving the analysis API on http://{server.server_address[0]}:{server.server_address[1]}",
+          file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def _project_id_list(value):
+    return [int(i) for i in value.split(",") if i]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze projects without the Gradio UI and write JSON results.")
+    parser.add_argument("--project", type=_project_id_list, action="extend", default=[],
+                        help="comma-separated project ids (repeatable)")
+    parser.add_argument("--user", type=int, help="analyze every active project of this user")
+    parser.add_argument("--all", action="store_true", help="analyze every active project")
+    parser.add_argument("--include-inactive", action="store_true", help="also analyze inactive projects")
+    parser.add_argument("--format", choices=("jsonl", "parquet"), default="jsonl")
+    parser.add_argument("--output", "-o", help="output file (default: JSON Lines on stdout)")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help="worker processes")
+    parser.add_argument("--top", type=int, default=BATCH_TOP_TASKS, help="vital-few tasks listed per project")
+    parser.add_argument("--recommendations", action="store_true", help="include the markdown report")
+    parser.add_argument("--serve", action="store_true", help="serve the JSON API instead")
+    parser.add_argument("--host", default=BATCH_API_HOST)
+    parser.add_argument("--port", type=int, default=BATCH_API_PORT)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        return serve(args.host, args.port, args.workers, args.recommendations)
+
+    if not (args.project or args.user is not None or args.all):
+        parser.error("select projects with --project, --user or --all")
+    if args.format == "parquet" and not args.output:
+        parser.error("--format parquet needs --output")
+
+    started = time.perf_counter()
+    project_ids = select_projects(args.project, args.user, args.include_inactive)
+    records = iter_project_records(project_ids, args.workers, args.top, args.recommendations)
+
+    try:
+        if args.format == "parquet":
+            written, errors = write_parquet(records, args.output)
+        elif args.output:
+            with open(args.output, "w", encoding="utf-8") as out:
+                written, errors = write_jsonl(records, out)
+        else:
+            written, errors = write_jsonl(records, sys.stdout)
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    print(f"Analyzed {written} projects ({errors} failed) in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+# Load test for a running PriorityLens app: simulates concurrent users through the
+# Gradio client API and reports latency percentiles per operation.
+#
+#   python app.py &
+#   python benchmarks/load_benchmark.py --url http://127.0.0.1:7860 --users 50 --duration 60 --project-id 1
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+
+from gradio_client import Client
+
+# Relative frequency of each simulated user action
+OPERATION_WEIGHTS = {
+    "refresh_tasks": 50,
+    "refresh_projects": 20,
+    "analyze": 20,
+    "add_task": 10,
+}
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(q / 100 * len(values)) - 1))
+    return values[index]
+
+
+def run_operation(client, operation, project_id, rng):
+    if operation == "refresh_tasks":
+        client.predict(project_id, "created", 50, 0, api_name="/refresh_tasks")
+    elif operation == "refresh_projects":
+        client.predict(api_name="/refresh_projects")
+    elif operation == "analyze":
+        client.predict(project_id, 0, api_name="/analyze")
+    elif operation == "add_task":
+        client.predict(
+            project_id, f"load test task {rng.randrange(10 ** 9)}", "",
+            rng.randint(1, 10), rng.randint(1, 10), rng.randint(1, 10), rng.randint(1, 10), "", "",
+            api_name="/add_task",
+        )
+
+
+def user_loop(url, project_id, deadline, seed, latencies, errors, lock):
+    rng = random.Random(seed)
+    client = Client(url, verbose=False)
+    operations = list(OPERATION_WEIGHTS)
+    weights = list(OPERATION_WEIGHTS.values())
+
+    while time.monotonic() < deadline:
+        operation = rng.choices(operations, weights)[0]
+        started = time.perf_counter()
+        try:
+            run_operation(client, operation, project_id, rng)
+        except Exception as e:
+            with lock:
+                errors[operation].append(str(e))
+            continue
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies[operation].append(elapsed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent-user load test for a running PriorityLens app.")
+    parser.add_argument("--url", default="http://127.0.0.1:7860")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=60, help="seconds to run")
+    parser.add_argument("--project-id", type=int, required=True)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    latencies = defaultdict(list)
+    errors = defaultdict(list)
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.duration
+
+    threads = [
+        threading.Thread(
+            target=user_loop,
+            args=(args.url, args.project_id, deadline, args.seed + i, latencies, errors, lock),
+            daemon=True,
+        )
+        for i in range(args.users)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    results = {"users": args.users, "duration": args.duration, "operations": {}}
+    print(f"{'operation':<18}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for operation in OPERATION_WEIGHTS:
+        values = latencies[operation]
+        row = {
+            "count": len(values),
+            "errors": len(errors[operation]),
+            "p50_ms": None if not values else percentile(values, 50) * 1000,
+            "p95_ms": None if not values else percentile(values, 95) * 1000,
+            "p99_ms": None if not values else percentile(values, 99) * 1000,
+            "max_ms": None if not values else max(values) * 1000,
+        }
+        results["operations"][operation] = row
+
+        def fmt(value):
+            return f"{value:>10.1f}" if value is not None else f"{'-':>10}"
+
+        print(f"{operation:<18}{row['count']:>8}{row['errors']:>8}"
+              f"{fmt(row['p50_ms'])}{fmt(row['p95_ms'])}{fmt(row['p99_ms'])}{fmt(row['max_ms'])}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    return 1 if any(errors.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
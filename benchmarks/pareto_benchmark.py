@@ -0,0 +1,211 @@
+# Benchmark suite for the analysis pipeline on seeded synthetic projects. Each stage
+# (scoring, ranking, Pareto-front layers, ranking index updates, weight sensitivity,
+# markdown, figures, database reads) is timed separately with its peak traced memory, and results are
+# written as JSON to compare across commits.
+#
+#   python benchmarks/pareto_benchmark.py --sizes 1000 100000 1000000 --json results.json
+#   python benchmarks/pareto_benchmark.py --embedded /tmp/bench-pg --json results.json
+#   python benchmarks/pareto_benchmark.py --storage sqlite --sizes 1000 100000
+#   python benchmarks/pareto_benchmark.py --skip-db --compare baseline.json
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_SIZES = (1000, 100000, 1000000)
+
+
+# Run fn once under tracemalloc for its peak memory (this also warms it up), then
+# `repeat` more times untraced for timing; returns (its last result, record)
+def measure(fn, repeat):
+    tracemalloc.start()
+    result = fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - started)
+    return result, {
+        "median_s": statistics.median(times),
+        "min_s": min(times),
+        "peak_bytes": peak,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# In-memory stages on generated tasks
+def bench_memory(size, seed, repeat):
+    import numpy as np
+
+    from app import get_recommendations, perform_pareto_analysis
+    from pareto import analyze_arrays, analyze_tasks, front_layers, score_arrays
+    from ranking import RankingIndex
+    from sensitivity import weight_sensitivity
+    from synthetic import generate_tasks, task_rows
+
+    tasks = generate_tasks(size, seed)
+    rows = task_rows(tasks)
+    stages = {}
+
+    _, stages["score"] = measure(lambda: score_arrays(
+        tasks["impact_score"], tasks["urgency_score"], tasks["alignment_score"], tasks["effort_score"]
+    ), repeat)
+
+    scores = score_arrays(tasks["impact_score"], tasks["urgency_score"], tasks["alignment_score"], tasks["effort_score"])
+    _, stages["sort"] = measure(lambda: np.argsort(-scores, kind="stable"), repeat)
+
+    _, stages["front_layers"] = measure(lambda: front_layers(
+        tasks["impact_score"], tasks["urgency_score"], tasks["alignment_score"], tasks["effort_score"]
+    ), repeat)
+
+    _, stages["rank_arrays"] = measure(lambda: analyze_arrays(
+        tasks["id"], tasks["name"], tasks["impact_score"], tasks["urgency_score"],
+        tasks["alignment_score"], tasks["effort_score"]
+    ), repeat)
+    result, stages["rank_rows"] = measure(lambda: analyze_tasks(rows), repeat)
+
+    # Incremental ranking: one build, then new tasks counted as they are added
+    index, stages["ranking_index_build"] = measure(lambda: RankingIndex(
+        tasks["id"], tasks["impact_score"], tasks["urgency_score"], tasks["alignment_score"], tasks["effort_score"]
+    ), repeat)
+    new_ids = itertools.count(int(tasks["id"].max()) + 1)
+    added = itertools.cycle([(9, 9, 9, 1), (1, 1, 1, 10)])
+    _, stages["ranking_index_update"] = measure(lambda: index.add(next(new_ids), *next(added)), repeat)
+    _, stages["ranking_index_query"] = measure(lambda: (index.rank(9, 9, 9, 1), index.cutoff()), repeat)
+    _, stages["ranking_index_summary"] = measure(lambda: index.summary(lambda ids: {}), repeat)
+    _, stages["sensitivity"] = measure(lambda: weight_sensitivity(
+        tasks["impact_score"], tasks["urgency_score"], tasks["alignment_score"], tasks["effort_score"]
+    ), repeat)
+
+    text, stages["markdown"] = measure(lambda: get_recommendations(result), repeat)
+    stages["markdown"]["output_bytes"] = len(text.encode("utf-8"))
+
+    figures, stages["figures"] = measure(lambda: perform_pareto_analysis(result), repeat)
+    payload, stages["figure_json"] = measure(lambda: [fig.to_json() for fig in figures], repeat)
+    stages["figure_json"]["output_bytes"] = sum(len(p) for p in payload)
+
+    return stages
+
+
+# Storage stages on a project loaded with the same generated tasks
+def bench_database(size, seed, repeat):
+    from app import _task_table
+    from storage import get_storage
+    from synthetic import ensure_project
+
+    storage = get_storage()
+    if not storage.initialize():
+        raise RuntimeError("Could not initialize the storage backend")
+    user_id = storage.create_demo_user()
+
+    started = time.perf_counter()
+    project_id = ensure_project(storage, user_id, size, seed)
+    stages = {"load": {"seconds": time.perf_counter() - started}}
+
+    _, stages["get_tasks"] = measure(lambda: storage.get_tasks(project_id), repeat)
+    _, stages["get_task_columns"] = measure(lambda: storage.get_task_columns(project_id), repeat)
+    _, stages["refresh_tasks"] = measure(lambda: _task_table(storage.get_task_page(project_id, 50)[0]), repeat)
+    if storage.server_side_analysis:
+        from database import get_pareto_summary
+        _, stages["pareto_summary"] = measure(lambda: get_pareto_summary(project_id), repeat)
+    return stages
+
+
+def compare(results, baseline):
+    old = {(r["size"], r["group"], r["stage"]): r for r in baseline["results"]}
+    print(f"\n{'size':>9}  {'stage':<26}{'base ms':>10}{'now ms':>10}{'ratio':>8}")
+    for row in results["results"]:
+        before = old.get((row["size"], row["group"], row["stage"]))
+        if not before or "median_s" not in row or "median_s" not in before:
+            continue
+        ratio = row["median_s"] / before["median_s"] if before["median_s"] else float("inf")
+        print(f"{row['size']:>9}  {row['group'] + '.' + row['stage']:<26}"
+              f"{before['median_s'] * 1000:>10.2f}{row['median_s'] * 1000:>10.2f}{ratio:>8.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark PriorityLens analysis stages on synthetic projects.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage; the median is reported")
+    parser.add_argument("--skip-db", action="store_true", help="only run the in-memory stages")
+    parser.add_argument("--storage", choices=("postgres", "sqlite", "memory"),
+                        help="storage backend for the database stages (default: STORAGE_BACKEND)")
+    parser.add_argument("--embedded", metavar="DIR",
+                        help="run the database stages on an embedded PostgreSQL (requires pgserver) kept in DIR")
+    parser.add_argument("--json", help="write results to this JSON file")
+    parser.add_argument("--compare", help="print timing ratios against an earlier JSON result file")
+    args = parser.parse_args(argv)
+
+    # Both must be set before storage.py and database.py are imported
+    if args.storage:
+        os.environ["STORAGE_BACKEND"] = args.storage
+
+    if args.embedded and not args.skip_db:
+        try:
+            import pgserver
+        except ImportError:
+            parser.error("--embedded requires the pgserver package (pip install pgserver)")
+        os.environ["DATABASE_URL"] = pgserver.get_server(args.embedded).get_uri()
+
+    import numpy as np
+
+    results = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "storage": None if args.skip_db else os.environ.get("STORAGE_BACKEND", "postgres"),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": [],
+    }
+
+    for size in args.sizes:
+        groups = [("memory", bench_memory)]
+        if not args.skip_db:
+            groups.append(("database", bench_database))
+
+        for group, bench in groups:
+            for stage, record in bench(size, args.seed, args.repeat).items():
+                results["results"].append(dict(size=size, group=group, stage=stage, **record))
+                if "median_s" in record:
+                    extra = f"  {record['output_bytes'] / 1024:.1f} KiB out" if "output_bytes" in record else ""
+                    print(f"{size:>9}  {group + '.' + stage:<26}{record['median_s'] * 1000:>10.2f} ms"
+                          f"{record['peak_bytes'] / 2 ** 20:>10.1f} MiB peak{extra}")
+                else:
+                    print(f"{size:>9}  {group + '.' + stage:<26}{record['seconds'] * 1000:>10.2f} ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+# Startup benchmark: launches the app repeatedly and measures the time from process start
+# until the server answers and until the first API request (project list) is served.
+#
+#   python benchmarks/startup_time.py --runs 5
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+from gradio_client import Client
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+def wait_for_server(url, deadline):
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.05)
+    return False
+
+
+def measure_once(port, timeout):
+    url = f"http://127.0.0.1:{port}"
+    env = dict(os.environ, GRADIO_SERVER_PORT=str(port), GRADIO_ANALYTICS_ENABLED="False")
+
+    started = time.monotonic()
+    process = subprocess.Popen(
+        [sys.executable, APP_PATH], env=env, cwd=os.path.dirname(APP_PATH),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        if not wait_for_server(url, started + timeout):
+            raise RuntimeError(f"App did not respond within {timeout}s")
+        server_ready = time.monotonic() - started
+
+        Client(url, verbose=False).predict(api_name="/refresh_projects")
+        first_request = time.monotonic() - started
+        return {"server_ready_s": server_ready, "first_request_s": first_request}
+    finally:
+        process.terminate()
+        try:
+            process.wait(10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure PriorityLens time-to-first-request.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=7861)
+    parser.add_argument("--timeout", type=float, default=60, help="seconds to wait for each start")
+    parser.add_argument("--json", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    runs = []
+    for i in range(args.runs):
+        run = measure_once(args.port, args.timeout)
+        runs.append(run)
+        print(f"run {i + 1}: server ready {run['server_ready_s']:.2f}s, first request {run['first_request_s']:.2f}s")
+
+    results = {
+        "runs": runs,
+        "median_server_ready_s": statistics.median(r["server_ready_s"] for r in runs),
+        "median_first_request_s": statistics.median(r["first_request_s"] for r in runs),
+    }
+    print(f"median: server ready {results['median_server_ready_s']:.2f}s, "
+          f"first request {results['median_first_request_s']:.2f}s")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+# Seeded synthetic task generator for the benchmarks. The same (size, seed) always
+# produces the same tasks, so results can be compared across commits.
+import csv
+import os
+import tempfile
+
+import numpy as np
+
+SCORE_LEVELS = 10
+STATUSES = ("PENDING", "IN_PROGRESS", "DONE")
+
+
+def _clip_scores(values):
+    return np.clip(np.rint(values), 1, SCORE_LEVELS).astype(np.int64)
+
+
+# Score columns with realistic shapes: most tasks are mid impact with a long tail of
+# high-impact ones, effort is right-skewed (many small tasks, a few big ones), urgency
+# follows impact loosely and alignment tracks impact more closely
+def generate_tasks(size, seed=0):
+    rng = np.random.default_rng(seed)
+
+    impact = _clip_scores(1 + 9 * rng.beta(2.0, 3.0, size))
+    effort = _clip_scores(rng.lognormal(mean=1.1, sigma=0.55, size=size))
+    urgency = _clip_scores(0.5 * impact + rng.normal(2.5, 2.0, size))
+    alignment = _clip_scores(0.7 * impact + rng.normal(1.5, 1.5, size))
+
+    # Due dates over the next year for about half of the tasks
+    days = rng.integers(0, 365, size)
+    has_due_date = rng.random(size) < 0.5
+    due_dates = np.where(
+        has_due_date, np.datetime64("2025-01-01") + days.astype("timedelta64[D]"), np.datetime64("NaT")
+    )
+
+    return {
+        "id": np.arange(1, size + 1, dtype=np.int64),
+        "name": np.array([f"Task {i:07d}" for i in range(1, size + 1)], dtype=object),
+        "impact_score": impact,
+        "urgency_score": urgency,
+        "effort_score": effort,
+        "alignment_score": alignment,
+        "status": np.array(STATUSES, dtype=object)[rng.integers(0, len(STATUSES), size)],
+        "due_date": due_dates,
+    }
+
+
+# The generated tasks as dict rows, shaped like database.get_tasks results
+def task_rows(tasks):
+    due_dates = [None if np.isnat(d) else d.item() for d in tasks["due_date"]]
+    return [
+        {
+            "id": int(tasks["id"][i]),
+            "name": tasks["name"][i],
+            "description": "",
+            "impact_score": int(tasks["impact_score"][i]),
+            "urgency_score": int(tasks["urgency_score"][i]),
+            "effort_score": int(tasks["effort_score"][i]),
+            "alignment_score": int(tasks["alignment_score"][i]),
+            "status": tasks["status"][i],
+            "due_date": due_dates[i],
+        }
+        for i in range(len(tasks["id"]))
+    ]
+
+
+# Write the generated tasks as a CSV file that bulk_import.import_tasks accepts
+def write_task_csv(tasks, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "description", "impact_score", "urgency_score",
+                         "effort_score", "alignment_score", "status", "due_date"])
+        for i in range(len(tasks["id"])):
+            due_date = tasks["due_date"][i]
+            writer.writerow([
+                tasks["name"][i], "",
+                tasks["impact_score"][i], tasks["urgency_score"][i],
+                tasks["effort_score"][i], tasks["alignment_score"][i],
+                tasks["status"][i], "" if np.isnat(due_date) else str(due_date),
+            ])
+
+
+# Project holding the generated tasks of (size, seed), created and loaded on first use.
+# PostgreSQL is loaded with COPY; other storage backends one add_task call at a time.
+def ensure_project(storage, user_id, size, seed=0):
+    name = f"benchmark-{size}-seed{seed}"
+    for project in storage.get_projects(user_id):
+        if project["name"] == name:
+            version = storage.get_task_version(project["id"])
+            if version and version[0] == size:
+                return project["id"]
+            raise RuntimeError(f"Project {name} exists with {version and version[0]} tasks, expected {size}")
+
+    success, message = storage.add_project(user_id, name, "Synthetic benchmark tasks")
+    if not success:
+        raise RuntimeError(message)
+    project_id = next(p["id"] for p in storage.get_projects(user_id) if p["name"] == name)
+
+    tasks = generate_tasks(size, seed)
+    if not storage.server_side_analysis:
+        for row in task_rows(tasks):
+            success, message, _ = storage.add_task(
+                project_id, row["name"], row["description"], row["impact_score"], row["urgency_score"],
+                row["effort_score"], row["alignment_score"], row["due_date"]
+            )
+            if not success:
+                raise RuntimeError(message)
+        return project_id
+
+    from bulk_import import import_tasks
+
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    try:
+        write_task_csv(tasks, path)
+        stats = import_tasks(project_id, path)
+    finally:
+        os.remove(path)
+    if stats.error or stats.rows_imported != size:
+        raise RuntimeError(f"Loading {name} failed: {stats.summary()}")
+    return project_id
@@ -0,0 +1,225 @@
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+
+from activity import activity_logger
+from events import notify_tasks_changed
+from validation import validate_task_fields
+
+# Rows validated and loaded per COPY transaction
+IMPORT_BATCH_SIZE = int(os.environ.get("IMPORT_BATCH_SIZE", "5000"))
+
+# Columns written by COPY, in the order produced by validate_task_fields
+_COPY_COLUMNS = (
+    "project_id", "name", "description", "impact_score", "urgency_score",
+    "effort_score", "alignment_score", "status", "due_date",
+)
+
+
+# Running totals of an import
+@dataclass
+class ImportStats:
+    rows_read: int = 0
+    rows_imported: int = 0
+    rows_rejected: int = 0
+    batches: int = 0
+    error: str = None
+    sample_rejects: list = field(default_factory=list)  # first few (line, reason) pairs
+
+    def summary(self):
+        text = f"Read {self.rows_read} rows: {self.rows_imported} imported, {self.rows_rejected} rejected."
+        if self.error:
+            text += f" Import stopped: {self.error}"
+        return text
+
+
+# Stream task rows from a CSV or JSON Lines file as (line number, mapping) pairs
+def iter_task_rows(path):
+    if path.lower().endswith((".jsonl", ".ndjson", ".json")):
+        with open(path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                if line.strip() == "":
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_no, e
+                    continue
+                yield line_no, row if isinstance(row, dict) else ValueError("Expected a JSON object")
+    else:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+
+
+# Escape a value for COPY's text format
+def _copy_value(value):
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+# (user_id,) of the project's owner, or None when the project does not exist
+def _project_owner(conn, project_id):
+    with conn.cursor() as cur:
+        cur.execute("SELECT user_id FROM projects WHERE id = %s", (project_id,))
+        return cur.fetchone()
+
+
+# Load one batch of validated rows with COPY FROM STDIN in its own transaction
+def _copy_batch(conn, project_id, records):
+    buffer = io.StringIO()
+    for record in records:
+        buffer.write("\t".join(_copy_value(v) for v in (project_id, *record)))
+        buffer.write("\n")
+    buffer.seek(0)
+
+    with conn.cursor() as cur:
+        cur.copy_expert(f"COPY tasks ({', '.join(_COPY_COLUMNS)}) FROM STDIN", buffer)
+    conn.commit()
+
+
+# Import tasks from a CSV/JSONL file into a project, one COPY per batch
+# on_progress(stats) runs after every batch, on_reject(line_no, reason) for every bad row
+def import_tasks(project_id, path, batch_size=None, on_progress=None, on_reject=None, max_sample_rejects=20):
+    # COPY is PostgreSQL only; database.py needs psycopg2
+    from database import db_connection
+
+    batch_size = batch_size or IMPORT_BATCH_SIZE
+    stats = ImportStats()
+
+    with db_connection() as conn:
+        if not conn:
+            stats.error = "Could not establish database connection"
+            return stats
+
+        owner = _project_owner(conn, project_id)
+        if owner is None:
+            stats.error = f"Project {project_id} does not exist"
+            return stats
+
+        def reject(line_no, reason):
+            stats.rows_rejected += 1
+            if len(stats.sample_rejects) < max_sample_rejects:
+                stats.sample_rejects.append((line_no, reason))
+            if on_reject:
+                on_reject(line_no, reason)
+
+        def flush(records):
+            try:
+                _copy_batch(conn, project_id, records)
+            except Exception as e:
+                conn.rollback()
+                stats.error = f"Error loading batch {stats.batches + 1}: {e}"
+                return False
+            stats.rows_imported += len(records)
+            stats.batches += 1
+            if on_progress:
+                on_progress(stats)
+            return True
+
+        try:
+            records = []
+            for line_no, row in iter_task_rows(path):
+                stats.rows_read += 1
+                if isinstance(row, Exception):
+                    reject(line_no, str(row))
+                    continue
+
+                try:
+                    records.append(validate_task_fields(row))
+                except ValueError as e:
+                    reject(line_no, str(e))
+                    continue
+
+                if len(records) >= batch_size:
+                    if not flush(records):
+                        break
+                    records = []
+            else:
+                if records:
+                    flush(records)
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            stats.error = f"Error reading {path}: {e}"
+        finally:
+            if stats.rows_imported:
+                notify_tasks_changed(project_id)
+                # One entry per import rather than one per task
+                activity_logger.record(owner[0], "IMPORT", f"Imported {stats.rows_imported} tasks from "
+                                       f"{os.path.basename(path)}", "project", project_id)
+
+    return stats
+
+
+# Columns written by export_tasks; the file can be imported again as is
+EXPORT_COLUMNS = (
+    "id", "name", "description", "impact_score", "urgency_score",
+    "effort_score", "alignment_score", "status", "due_date",
+)
+
+
+# Write all tasks of a project to a CSV file, streamed from a server-side cursor
+def export_tasks(project_id, path):
+    from database import iter_tasks
+
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_COLUMNS)
+        for row in iter_tasks(project_id, EXPORT_COLUMNS):
+            writer.writerow("" if value is None else value for value in row)
+            count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import tasks from a CSV or JSON Lines file.")
+    parser.add_argument("project_id", type=int, help="project to import the tasks into")
+    parser.add_argument("path", help="CSV or .jsonl file with name, description, impact_score, urgency_score, "
+                                     "effort_score, alignment_score, due_date and status columns")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE, help="rows per COPY transaction")
+    parser.add_argument("--rejects", help="write rejected rows (line, reason) to this CSV file")
+    parser.add_argument("--export", action="store_true", help="export the project's tasks to PATH instead")
+    args = parser.parse_args(argv)
+
+    if args.export:
+        print(f"Exported {export_tasks(args.project_id, args.path)} tasks to {args.path}")
+        return 0
+
+    reject_file = open(args.rejects, "w", newline="", encoding="utf-8") if args.rejects else None
+    reject_writer = csv.writer(reject_file) if reject_file else None
+    if reject_writer:
+        reject_writer.writerow(["line", "reason"])
+
+    def on_reject(line_no, reason):
+        if reject_writer:
+            reject_writer.writerow([line_no, reason])
+        else:
+            print(f"line {line_no}: {reason}", file=sys.stderr)
+
+    def on_progress(stats):
+        print(f"{stats.rows_imported} imported, {stats.rows_rejected} rejected", file=sys.stderr)
+
+    try:
+        stats = import_tasks(args.project_id, args.path, args.batch_size, on_progress, on_reject)
+    finally:
+        if reject_file:
+            reject_file.close()
+
+    print(stats.summary())
+    return 1 if stats.error else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+import functools
+import inspect
+import os
+import threading
+
+from metrics import instrument_handler
+
+# Concurrent handler limits per class; reads and writes stay responsive while analyses run
+READ_CONCURRENCY = int(os.environ.get("READ_CONCURRENCY", "8"))
+WRITE_CONCURRENCY = int(os.environ.get("WRITE_CONCURRENCY", "4"))
+ANALYSIS_CONCURRENCY = int(os.environ.get("ANALYSIS_CONCURRENCY", "2"))
+
+# Pending heavy requests held by the Gradio queue, and worker threads for unqueued handlers
+QUEUE_MAX_SIZE = int(os.environ.get("QUEUE_MAX_SIZE", "64"))
+APP_MAX_THREADS = int(os.environ.get("APP_MAX_THREADS", "40"))
+
+# Seconds a request waits for a free slot before it is turned away
+HANDLER_WAIT_TIMEOUT = float(os.environ.get("HANDLER_WAIT_TIMEOUT", "30"))
+
+
+class HandlerBusyError(Exception):
+    pass
+
+
+# Bounded concurrency per handler class ("read", "write", "analysis")
+class HandlerLimiter:
+    def __init__(self, limits, timeout=30.0):
+        self.limits = dict(limits)
+        self.timeout = timeout
+        # Raised when no slot frees up in time; the app swaps in gr.Error for a friendly message
+        self.busy_error = HandlerBusyError
+
+        self._lock = threading.Lock()
+        self._slots = {name: threading.BoundedSemaphore(limit) for name, limit in self.limits.items()}
+        self._stats = {name: {"active": 0, "waiting": 0, "completed": 0, "rejected": 0} for name in self.limits}
+
+    def _acquire(self, handler_class):
+        stats = self._stats[handler_class]
+        slots = self._slots[handler_class]
+        if slots.acquire(blocking=False):
+            with self._lock:
+                stats["active"] += 1
+            return
+
+        with self._lock:
+            stats["waiting"] += 1
+        try:
+            acquired = slots.acquire(timeout=self.timeout)
+        finally:
+            with self._lock:
+                stats["waiting"] -= 1
+
+        if not acquired:
+            with self._lock:
+                stats["rejected"] += 1
+            raise self.busy_error("The server is busy right now, please try again in a moment.")
+
+        with self._lock:
+            stats["active"] += 1
+
+    def _release(self, handler_class):
+        with self._lock:
+            self._stats[handler_class]["active"] -= 1
+            self._stats[handler_class]["completed"] += 1
+        self._slots[handler_class].release()
+
+    # Decorator limiting a handler (plain or generator function) to its class's slots;
+    # its latency, including time spent waiting for a slot, is recorded when metrics are enabled
+    def limit(self, handler_class):
+        if handler_class not in self._slots:
+            raise ValueError(f"Unknown handler class: {handler_class}")
+
+        def decorator(fn):
+            if inspect.isgeneratorfunction(fn):
+                @functools.wraps(fn)
+                def generator_wrapper(*args, **kwargs):
+                    self._acquire(handler_class)
+                    try:
+                        yield from fn(*args, **kwargs)
+                    finally:
+                        self._release(handler_class)
+                return instrument_handler(generator_wrapper, handler_class)
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                self._acquire(handler_class)
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self._release(handler_class)
+            return instrument_handler(wrapper, handler_class)
+
+        return decorator
+
+    def stats(self):
+        with self._lock:
+            return {
+                name: dict(stats, limit=self.limits[name])
+                for name, stats in self._stats.items()
+            }
+
+
+# Shared limiter for the Gradio handlers
+handler_limiter = HandlerLimiter(
+    {"read": READ_CONCURRENCY, "write": WRITE_CONCURRENCY, "analysis": ANALYSIS_CONCURRENCY},
+    timeout=HANDLER_WAIT_TIMEOUT,
+)
+
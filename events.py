@@ -0,0 +1,47 @@
+# Callbacks run with a project id whenever that project's tasks change
+_task_change_listeners = []
+
+
+def register_task_change_listener(callback):
+    _task_change_listeners.append(callback)
+
+
+def notify_tasks_changed(project_id):
+    for callback in _task_change_listeners:
+        try:
+            callback(project_id)
+        except Exception as e:
+            print(f"Error in task change listener: {e}")
+
+
+# Callbacks run with (project_id, task_id, impact, urgency, alignment, effort) for every
+# task added through add_task, before the task change listeners
+_task_insert_listeners = []
+
+
+def register_task_insert_listener(callback):
+    _task_insert_listeners.append(callback)
+
+
+def notify_task_added(project_id, task_id, impact_score, urgency_score, alignment_score, effort_score):
+    for callback in _task_insert_listeners:
+        try:
+            callback(project_id, task_id, impact_score, urgency_score, alignment_score, effort_score)
+        except Exception as e:
+            print(f"Error in task insert listener: {e}")
+
+
+# Callbacks run with a user id whenever that user's project list changes
+_project_change_listeners = []
+
+
+def register_project_change_listener(callback):
+    _project_change_listeners.append(callback)
+
+
+def notify_projects_changed(user_id):
+    for callback in _project_change_listeners:
+        try:
+            callback(user_id)
+        except Exception as e:
+            print(f"Error in project change listener: {e}")
@@ -0,0 +1,217 @@
+import bisect
+import functools
+import inspect
+import os
+import threading
+import time
+
+# Collect handler and query metrics; when off, the instrumentation decorators
+# return the original functions, so there is no per-call cost
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "false").lower() in ("1", "true", "yes")
+
+# Queries slower than this many milliseconds are logged
+SLOW_QUERY_THRESHOLD_MS = float(os.environ.get("SLOW_QUERY_THRESHOLD_MS", "500"))
+
+# Path of the Prometheus text endpoint served next to the Gradio app
+METRICS_PATH = os.environ.get("METRICS_PATH", "/metrics")
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000, 1000000, 10000000, 100000000)
+
+
+# Cumulative-bucket histogram per label set
+class Histogram:
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series = {}  # labels -> [bucket counts..., sum, count]
+
+    def observe(self, labels, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+        for labels, values in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(labels, le=_number(bound))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_labels(labels, le='+Inf')} {values[-1]}")
+            lines.append(f"{self.name}_sum{_labels(labels)} {_number(values[-2])}")
+            lines.append(f"{self.name}_count{_labels(labels)} {values[-1]}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            lines.append(f"{self.name}{_labels(labels)} {_number(value)}")
+        return lines
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# labels are stored as sorted (name, value) tuples
+def _labels(labels, **extra):
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+handler_seconds = Histogram("prioritylens_handler_seconds", "Gradio handler latency in seconds.", LATENCY_BUCKETS)
+handler_errors = Counter("prioritylens_handler_errors_total", "Gradio handler calls that raised.")
+handler_payload_bytes = Histogram(
+    "prioritylens_handler_payload_bytes", "Approximate size of handler outputs (figures, tables, text).", SIZE_BUCKETS
+)
+query_seconds = Histogram("prioritylens_query_seconds", "Database call latency in seconds.", LATENCY_BUCKETS)
+query_rows = Histogram("prioritylens_query_rows", "Rows returned per database call.", SIZE_BUCKETS)
+slow_queries = Counter("prioritylens_slow_queries_total", "Database calls slower than SLOW_QUERY_THRESHOLD_MS.")
+
+_collectors = []  # functions returning (name, help, type, [(labels, value)]) tuples at scrape time
+
+
+# Register a function sampled on every scrape (pool, limiter and cache statistics)
+def register_collector(collector):
+    _collectors.append(collector)
+
+
+# Approximate serialized size of a handler output
+def payload_size(value):
+    if value is None:
+        return 0
+    if isinstance(value, (tuple, list)):
+        return sum(payload_size(item) for item in value)
+    if isinstance(value, str):
+        return len(value)
+    if hasattr(value, "to_plotly_json"):  # plotly figure
+        return len(value.to_json())
+    if hasattr(value, "memory_usage"):  # pandas DataFrame
+        return int(value.memory_usage(index=False).sum())
+    if isinstance(value, dict):
+        return sum(payload_size(item) for item in value.values())
+    return 0
+
+
+# Row count of a data function result, or None when it is not a row list
+def _row_count(result):
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, tuple) and result and isinstance(result[0], list):
+        return len(result[0])  # (rows, next_cursor)
+    return None
+
+
+# Time a Gradio handler (plain or generator function) and measure what it returns
+def instrument_handler(fn, handler_class=""):
+    if not METRICS_ENABLED:
+        return fn
+
+    labels = (("class", handler_class), ("handler", fn.__name__))
+    name_labels = (("handler", fn.__name__),)
+
+    if inspect.isgeneratorfunction(fn):
+        @functools.wraps(fn)
+        def generator_wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            output = None
+            try:
+                for output in fn(*args, **kwargs):
+                    yield output
+            except Exception:
+                handler_errors.inc(labels)
+                raise
+            finally:
+                handler_seconds.observe(labels, time.perf_counter() - started)
+            handler_payload_bytes.observe(name_labels, payload_size(output))
+        return generator_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            output = fn(*args, **kwargs)
+        except Exception:
+            handler_errors.inc(labels)
+            raise
+        finally:
+            handler_seconds.observe(labels, time.perf_counter() - started)
+        handler_payload_bytes.observe(name_labels, payload_size(output))
+        return output
+    return wrapper
+
+
+# Decorator timing a database call, counting its rows and logging it when slow
+def instrument_query(name):
+    def decorator(fn):
+        if not METRICS_ENABLED:
+            return fn
+
+        labels = (("query", name),)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            result = fn(*args, **kwargs)
+            elapsed = time.perf_counter() - started
+
+            query_seconds.observe(labels, elapsed)
+            rows = _row_count(result)
+            if rows is not None:
+                query_rows.observe(labels, rows)
+            if elapsed * 1000 >= SLOW_QUERY_THRESHOLD_MS:
+                slow_queries.inc(labels)
+                # Arguments carry task names and descriptions, so only the query name is logged
+                print(f"Slow query {name}: {elapsed * 1000:.0f} ms"
+                      + (f", {rows} rows" if rows is not None else ""))
+            return result
+        return wrapper
+    return decorator
+
+
+# All metrics in the Prometheus text exposition format
+def render_metrics():
+    lines = []
+    for metric in (handler_seconds, handler_errors, handler_payload_bytes, query_seconds, query_rows, slow_queries):
+        lines.extend(metric.render())
+
+    for collector in _collectors:
+        try:
+            samples = collector()
+        except Exception as e:
+            print(f"Error collecting metrics: {e}")
+            continue
+        for name, help_text, metric_type, values in samples:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in values:
+                lines.append(f"{name}{_labels(labels)} {_number(value)}")
+    return "\n".join(lines) + "\n"
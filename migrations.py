@@ -0,0 +1,94 @@
+import os
+import re
+import sys
+from collections import namedtuple
+
+import psycopg2
+
+from database import db_connection
+
+# Versioned schema changes live in migrations/NNN_description.sql and are applied in order.
+# schema.sql mirrors the result of applying all of them; keep both in step.
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+# Advisory lock key so concurrent app instances don't migrate at the same time
+MIGRATION_LOCK_ID = 7286014
+
+Migration = namedtuple("Migration", ["version", "name", "path"])
+
+_MIGRATION_FILE = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+
+# Migrations found on disk, ordered by version
+def load_migrations(directory=MIGRATIONS_DIR):
+    migrations = []
+    for filename in os.listdir(directory):
+        match = _MIGRATION_FILE.match(filename)
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2), os.path.join(directory, filename)))
+    migrations.sort()
+
+    versions = [m.version for m in migrations]
+    if len(set(versions)) != len(versions):
+        raise ValueError(f"Duplicate migration versions in {directory}")
+    return migrations
+
+
+# Latest applied migration version; 0 for a database that was never migrated
+def get_schema_version(conn):
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT COALESCE(MAX(version), 0) FROM schema_migrations")
+            return cur.fetchone()[0]
+    except psycopg2.errors.UndefinedTable:
+        conn.rollback()
+        return 0
+
+
+# Bring the schema up to date; a single version check when nothing is pending
+def run_migrations(directory=MIGRATIONS_DIR):
+    migrations = load_migrations(directory)
+    latest = migrations[-1].version if migrations else 0
+
+    with db_connection() as conn:
+        if not conn:
+            return False
+
+        try:
+            if get_schema_version(conn) >= latest:
+                conn.rollback()
+                return True
+
+            with conn.cursor() as cur:
+                cur.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK_ID,))
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS schema_migrations (
+                        version INTEGER PRIMARY KEY,
+                        name VARCHAR(255) NOT NULL,
+                        applied_at TIMESTAMP NOT NULL DEFAULT NOW()
+                    );
+                """)
+
+                # Another instance may have migrated while we waited for the lock
+                current = get_schema_version(conn)
+                for migration in migrations:
+                    if migration.version <= current:
+                        continue
+                    with open(migration.path, encoding="utf-8") as f:
+                        cur.execute(f.read())
+                    cur.execute(
+                        "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                        (migration.version, migration.name)
+                    )
+                    print(f"Applied migration {migration.version:03d}_{migration.name}")
+
+            conn.commit()
+            return True
+        except Exception as e:
+            print(f"Error running migrations: {e}")
+            conn.rollback()
+            return False
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_migrations() else 1)
@@ -0,0 +1,7 @@
+-- Stored Pareto score (same formula as pareto.score_arrays) and its top-K index
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS pareto_score DOUBLE PRECISION
+GENERATED ALWAYS AS (
+    (impact_score * 0.4::float8 + urgency_score * 0.3::float8 + alignment_score * 0.3::float8) / effort_score * 10
+) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_tasks_project_pareto_score ON tasks(project_id, pareto_score DESC);
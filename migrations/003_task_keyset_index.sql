@@ -0,0 +1,2 @@
+-- Keyset pagination index for the task table
+CREATE INDEX IF NOT EXISTS idx_tasks_project_created ON tasks(project_id, created_at DESC, id DESC);
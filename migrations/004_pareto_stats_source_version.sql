@@ -0,0 +1,6 @@
+-- Task version each Pareto snapshot was computed from
+ALTER TABLE pareto_stats
+ADD COLUMN IF NOT EXISTS source_task_count INTEGER,
+ADD COLUMN IF NOT EXISTS source_updated_at TIMESTAMP;
+
+CREATE INDEX IF NOT EXISTS idx_pareto_stats_project_date ON pareto_stats(project_id, analysis_date DESC);
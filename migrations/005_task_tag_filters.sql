@@ -0,0 +1,6 @@
+-- Tag names are unique so tagging can reuse an existing tag by name
+CREATE UNIQUE INDEX IF NOT EXISTS idx_tags_name ON tags(name);
+
+-- Tag filters read a tag's task ids from this index alone; it replaces the single-column tag index
+CREATE INDEX IF NOT EXISTS idx_task_tags_tag_task ON task_tags(tag_id, task_id);
+DROP INDEX IF EXISTS idx_task_tags_tag_id;
@@ -0,0 +1,25 @@
+-- Per-project Pareto score weights (defaults match pareto.DEFAULT_WEIGHTS)
+ALTER TABLE projects
+ADD COLUMN IF NOT EXISTS impact_weight DOUBLE PRECISION NOT NULL DEFAULT 0.4,
+ADD COLUMN IF NOT EXISTS urgency_weight DOUBLE PRECISION NOT NULL DEFAULT 0.3,
+ADD COLUMN IF NOT EXISTS alignment_weight DOUBLE PRECISION NOT NULL DEFAULT 0.3;
+
+-- The stored score now follows the project's weights, so it is kept by a trigger
+-- instead of a generated expression; existing values are unchanged
+ALTER TABLE tasks ALTER COLUMN pareto_score DROP EXPRESSION IF EXISTS;
+
+CREATE OR REPLACE FUNCTION set_task_pareto_score() RETURNS trigger AS $$
+BEGIN
+    SELECT (NEW.impact_score * p.impact_weight + NEW.urgency_score * p.urgency_weight
+            + NEW.alignment_score * p.alignment_weight) / NEW.effort_score * 10
+    INTO NEW.pareto_score
+    FROM projects p
+    WHERE p.id = NEW.project_id;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tasks_pareto_score ON tasks;
+CREATE TRIGGER tasks_pareto_score
+BEFORE INSERT OR UPDATE OF project_id, impact_score, urgency_score, effort_score, alignment_score ON tasks
+FOR EACH ROW EXECUTE FUNCTION set_task_pareto_score();
@@ -0,0 +1,3 @@
+-- Rankings break score ties by id, newest first; let the score index serve that order
+DROP INDEX IF EXISTS idx_tasks_project_pareto_score;
+CREATE INDEX IF NOT EXISTS idx_tasks_project_pareto_score ON tasks(project_id, pareto_score DESC, id DESC);
@@ -0,0 +1,474 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+# Default Pareto score weights; projects can override them (projects.*_weight)
+IMPACT_WEIGHT = 0.4
+URGENCY_WEIGHT = 0.3
+ALIGNMENT_WEIGHT = 0.3
+DEFAULT_WEIGHTS = (IMPACT_WEIGHT, URGENCY_WEIGHT, ALIGNMENT_WEIGHT)
+
+# Share of the total score covered by the "vital few" tasks
+PARETO_THRESHOLD = 80
+
+# Scores are integers from 1 to SCORE_LEVELS
+SCORE_LEVELS = 10
+
+# Scores above this value count as high impact / high effort; the quadrant chart
+# draws its dividers halfway to the next integer score
+QUADRANT_THRESHOLD = 5
+QUADRANT_DIVIDER = QUADRANT_THRESHOLD + 0.5
+
+# Quadrant codes, indexed by the values returned from classify_quadrants
+DO_NOW, PLAN, DELEGATE, ELIMINATE = 0, 1, 2, 3
+QUADRANT_LABELS = ("DO NOW", "PLAN", "DELEGATE", "ELIMINATE")
+
+
+# Vectorized Pareto score for whole score arrays; weights are (impact, urgency, alignment)
+def score_arrays(impact, urgency, alignment, effort, weights=None):
+    impact = np.asarray(impact, dtype=np.float64)
+    urgency = np.asarray(urgency, dtype=np.float64)
+    alignment = np.asarray(alignment, dtype=np.float64)
+    effort = np.asarray(effort, dtype=np.float64)
+    impact_weight, urgency_weight, alignment_weight = weights or DEFAULT_WEIGHTS
+
+    # Impact, urgency and alignment add value, effort divides it
+    value = impact * impact_weight + urgency * urgency_weight + alignment * alignment_weight
+    efficiency = np.divide(value, effort, out=value.copy(), where=effort > 0)
+    return efficiency * 10  # Convert to a 0-100 scale
+
+
+# Quadrant code per task (DO_NOW, PLAN, DELEGATE or ELIMINATE)
+def classify_quadrants(impact, effort):
+    low_impact = np.asarray(impact) <= QUADRANT_THRESHOLD
+    high_effort = np.asarray(effort) > QUADRANT_THRESHOLD
+    return (low_impact.astype(np.int8) * 2 + high_effort.astype(np.int8)).astype(np.int8)
+
+
+# Score grid cells in dominance order: cells are indexed by (impact, urgency, alignment,
+# SCORE_LEVELS - effort) counted from 0, so a higher index is better on every axis, and
+# grouped by coordinate sum so each group only depends on the group above it
+_GRID_SHAPE = (SCORE_LEVELS,) * 4
+_GRID_COORDS = np.indices(_GRID_SHAPE).reshape(4, -1)
+_GRID_LEVELS = [
+    tuple(_GRID_COORDS[:, _GRID_COORDS.sum(axis=0) == level])
+    for level in range(4 * (SCORE_LEVELS - 1), -1, -1)
+]
+
+
+# Grid cell of every task
+def grid_cells(impact, urgency, alignment, effort):
+    return np.ravel_multi_index((
+        np.asarray(impact, dtype=np.int64) - 1,
+        np.asarray(urgency, dtype=np.int64) - 1,
+        np.asarray(alignment, dtype=np.int64) - 1,
+        SCORE_LEVELS - np.asarray(effort, dtype=np.int64),
+    ), _GRID_SHAPE)
+
+
+# Pareto-front layer of every occupied grid cell (0 for empty cells). A task dominates
+# another when it is at least as good on every score and better on one; layer 1 holds
+# the tasks nothing dominates, and layer k + 1 the front left after removing layers 1..k.
+# A cell's layer is one more than the highest layer among the cells dominating it, so
+# one sweep over the 10^4 cells from the best corner down computes every layer.
+def grid_layers(occupied):
+    occupied = np.asarray(occupied, dtype=bool).reshape(_GRID_SHAPE)
+    layers = np.zeros(_GRID_SHAPE, dtype=np.int32)
+    # Highest layer among the occupied cells at least as good as each cell, padded by one on every axis
+    best = np.zeros((SCORE_LEVELS + 1,) * 4, dtype=np.int32)
+    for i, u, a, e in _GRID_LEVELS:
+        above = np.maximum(
+            np.maximum(best[i + 1, u, a, e], best[i, u + 1, a, e]),
+            np.maximum(best[i, u, a + 1, e], best[i, u, a, e + 1]),
+        )
+        layer = np.where(occupied[i, u, a, e], above + 1, 0)
+        layers[i, u, a, e] = layer
+        best[i, u, a, e] = np.maximum(above, layer)
+    return layers.reshape(-1)
+
+
+# Pareto-front layer of every task (1 = non-dominated) by non-dominated sorting over
+# impact, urgency and alignment (higher is better) and effort (lower is better).
+# Tasks are bucketed into the score grid, so this is linear in the task count.
+def front_layers(impact, urgency, alignment, effort):
+    cells = grid_cells(impact, urgency, alignment, effort)
+    occupied = np.zeros(SCORE_LEVELS ** 4, dtype=bool)
+    occupied[cells] = True
+    return grid_layers(occupied)[cells].astype(np.int64)
+
+
+# Ranked analysis of a set of tasks; every array is sorted by score, highest first
+@dataclass
+class ParetoResult:
+    ids: np.ndarray
+    names: np.ndarray
+    impact: np.ndarray
+    urgency: np.ndarray
+    effort: np.ndarray
+    alignment: np.ndarray
+    scores: np.ndarray
+    score_percentage: np.ndarray
+    cumulative_percentage: np.ndarray
+    quadrants: np.ndarray
+    layers: np.ndarray  # Pareto-front layer (1 = non-dominated; 0 where unknown)
+    cutoff: int
+    total_score: float
+
+    def __len__(self):
+        return len(self.scores)
+
+    @property
+    def total_tasks(self):
+        return len(self.scores)
+
+    # Task count per Pareto-front layer, starting with layer 1
+    @property
+    def layer_counts(self):
+        return np.bincount(self.layers)[1:]
+
+    # Tasks that make up the first PARETO_THRESHOLD percent of the total score
+    @property
+    def top_percentage(self):
+        if self.total_tasks == 0:
+            return 0.0
+        return self.cutoff / self.total_tasks * 100
+
+    # Ranked positions of the tasks in a quadrant
+    def quadrant_positions(self, quadrant):
+        return np.flatnonzero(self.quadrants == quadrant)
+
+    # Task count per quadrant code
+    @property
+    def quadrant_counts(self):
+        return np.bincount(self.quadrants, minlength=4)
+
+
+# Score, rank and classify tasks given as parallel arrays
+def analyze_arrays(ids, names, impact, urgency, alignment, effort, weights=None):
+    ids = np.asarray(ids)
+    names = np.asarray(names, dtype=object)
+    impact = np.asarray(impact)
+    urgency = np.asarray(urgency)
+    alignment = np.asarray(alignment)
+    effort = np.asarray(effort)
+
+    scores = score_arrays(impact, urgency, alignment, effort, weights)
+    # Highest score first, ties newest (highest id) first: the order of every SQL ranking
+    order = np.lexsort((-ids, -scores))
+    scores = scores[order]
+
+    total_score = float(scores.sum())
+    if total_score > 0:
+        score_percentage = scores / total_score * 100
+        cumulative_percentage = np.cumsum(scores) / total_score * 100
+    else:
+        score_percentage = np.zeros_like(scores)
+        cumulative_percentage = np.zeros_like(scores)
+
+    # At least one task is always in the vital few
+    cutoff = int(np.searchsorted(cumulative_percentage, PARETO_THRESHOLD, side="right"))
+    cutoff = max(cutoff, min(1, len(scores)))
+
+    layers = front_layers(impact, urgency, alignment, effort)[order]
+    impact = impact[order]
+    effort = effort[order]
+    return ParetoResult(
+        ids=ids[order],
+        names=names[order],
+        impact=impact,
+        urgency=urgency[order],
+        effort=effort,
+        alignment=alignment[order],
+        scores=scores,
+        score_percentage=score_percentage,
+        cumulative_percentage=cumulative_percentage,
+        quadrants=classify_quadrants(impact, effort),
+        layers=layers,
+        cutoff=cutoff,
+        total_score=total_score,
+    )
+
+
+# Score, rank and classify task rows as returned by get_tasks
+def analyze_tasks(tasks, weights=None):
+    n = len(tasks)
+
+    def column(key, dtype):
+        return np.fromiter((t[key] for t in tasks), dtype=dtype, count=n)
+
+    return analyze_arrays(
+        ids=column("id", np.int64),
+        names=np.array([t["name"] for t in tasks], dtype=object),
+        impact=column("impact_score", np.int64),
+        urgency=column("urgency_score", np.int64),
+        alignment=column("alignment_score", np.int64),
+        effort=column("effort_score", np.int64),
+        weights=weights,
+    )
+
+
+# Score, rank and classify the (ids, impact, urgency, alignment, effort) arrays returned
+# by get_task_columns. Names start out as None; name_tasks fills in the displayed ones.
+def analyze_columns(columns, weights=None):
+    ids, impact, urgency, alignment, effort = columns
+    return analyze_arrays(ids, np.full(len(ids), None, dtype=object), impact, urgency, alignment, effort, weights)
+
+
+# Fill in the names of the tasks at the given ranked positions; fetch_names maps a list
+# of task ids to {id: name}. Positions that already have a name are not fetched again.
+def name_tasks(result, positions, fetch_names):
+    positions = np.unique(np.asarray(positions, dtype=np.int64))
+    positions = positions[np.equal(result.names[positions], None)]
+    if len(positions):
+        ids = result.ids[positions].tolist()
+        found = fetch_names(ids)
+        result.names[positions] = [found.get(task_id, "") for task_id in ids]
+    return result
+
+
+# Sample a cumulative curve at about `points` evenly spaced ranks, always keeping
+# the first point, the last point and the 80% cutoff; returns (1-based ranks, values)
+def downsample_curve(cumulative_percentage, points, cutoff=None):
+    n = len(cumulative_percentage)
+    if n == 0:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.float64)
+
+    positions = np.linspace(0, n - 1, num=min(points, n)).round().astype(np.int64)
+    if cutoff:
+        positions = np.append(positions, cutoff - 1)
+    positions = np.unique(positions)
+    return positions + 1, np.asarray(cumulative_percentage)[positions]
+
+
+# Totals per (effort, impact) cell; only the (at most 100) non-empty cells are returned
+# as (effort, impact, count, mean score, mean urgency) arrays. `counts` weighs rows that
+# stand for several tasks (score profiles).
+def aggregate_cells(effort, impact, scores, urgency, counts=None):
+    size = SCORE_LEVELS * SCORE_LEVELS
+    cell = (np.asarray(effort) - 1) * SCORE_LEVELS + (np.asarray(impact) - 1)
+    if counts is None:
+        count = np.bincount(cell, minlength=size)
+        score_sum = np.bincount(cell, weights=scores, minlength=size)
+        urgency_sum = np.bincount(cell, weights=urgency, minlength=size)
+    else:
+        counts = np.asarray(counts, dtype=np.float64)
+        count = np.bincount(cell, weights=counts, minlength=size).astype(np.int64)
+        score_sum = np.bincount(cell, weights=np.asarray(scores) * counts, minlength=size)
+        urgency_sum = np.bincount(cell, weights=np.asarray(urgency) * counts, minlength=size)
+
+    filled = np.flatnonzero(count)
+    return (
+        filled // SCORE_LEVELS + 1,
+        filled % SCORE_LEVELS + 1,
+        count[filled],
+        score_sum[filled] / count[filled],
+        urgency_sum[filled] / count[filled],
+    )
+
+
+# Pareto-front totals per (effort, impact) cell, for the same cells as aggregate_cells:
+# (tasks on the front, best layer) arrays. `counts` weighs rows that stand for several tasks.
+def aggregate_front_cells(effort, impact, layers, counts=None):
+    size = SCORE_LEVELS * SCORE_LEVELS
+    cell = (np.asarray(effort) - 1) * SCORE_LEVELS + (np.asarray(impact) - 1)
+    layers = np.asarray(layers)
+    counts = np.ones(len(cell)) if counts is None else np.asarray(counts)
+    occupied = np.bincount(cell, weights=counts, minlength=size)
+    front_count = np.bincount(cell, weights=counts * (layers == 1), minlength=size)
+    best_layer = np.full(size, np.iinfo(np.int64).max)
+    np.minimum.at(best_layer, cell, layers)
+
+    filled = np.flatnonzero(occupied)
+    return front_count[filled].astype(np.int64), best_layer[filled]
+
+
+# Aggregated analysis of a large project: the vital-few rows plus per-cell and per-quadrant totals
+@dataclass
+class ParetoSummary:
+    top: ParetoResult  # ranked vital-few tasks, possibly truncated to a row limit
+    vital_count: int
+    total_tasks: int
+    total_score: float
+    cell_effort: np.ndarray
+    cell_impact: np.ndarray
+    cell_count: np.ndarray
+    cell_score: np.ndarray  # mean Pareto score per cell
+    cell_urgency: np.ndarray  # mean urgency per cell
+    cell_front_count: np.ndarray  # tasks on the Pareto front per cell
+    cell_best_layer: np.ndarray  # lowest Pareto-front layer per cell (0 where unknown)
+    layer_counts: np.ndarray  # task count per Pareto-front layer, starting with layer 1
+    quadrant_counts: np.ndarray  # task count per quadrant code
+    quadrant_top: dict  # quadrant code -> [(name, score), ...] ordered by score
+    curve_rank: np.ndarray  # sampled 1-based ranks of the cumulative curve
+    curve_percentage: np.ndarray  # exact cumulative percentage at those ranks
+
+    def __len__(self):
+        return self.total_tasks
+
+    @property
+    def top_percentage(self):
+        if self.total_tasks == 0:
+            return 0.0
+        return self.vital_count / self.total_tasks * 100
+
+
+# Build a ParetoSummary from the rows returned by database.get_pareto_summary.
+# profile_rows are (impact, urgency, alignment, effort, task count, score sum) per
+# distinct score combination; cells and Pareto-front layers are derived from them.
+def build_pareto_summary(top_rows, profile_rows, quadrant_rows, curve_rows):
+    profiles = np.array(profile_rows, dtype=np.float64).reshape(-1, 6)
+    impact, urgency, alignment, effort = (profiles[:, column].astype(np.int64) for column in range(4))
+    profile_count = profiles[:, 4]
+    total_tasks = int(profile_count.sum())
+    total_score = float(profiles[:, 5].sum())
+
+    cell_effort, cell_impact, cell_count, cell_score, cell_urgency = aggregate_cells(
+        effort, impact, profiles[:, 5] / np.maximum(profile_count, 1), urgency, profile_count
+    )
+
+    occupied = np.zeros(SCORE_LEVELS ** 4, dtype=bool)
+    profile_cells = grid_cells(impact, urgency, alignment, effort)
+    occupied[profile_cells] = True
+    layer_grid = grid_layers(occupied)
+    profile_layers = layer_grid[profile_cells]
+    cell_front_count, cell_best_layer = aggregate_front_cells(effort, impact, profile_layers, profile_count)
+
+    quadrant_counts = np.bincount(
+        classify_quadrants(cell_impact, cell_effort), weights=cell_count, minlength=4
+    ).astype(np.int64)
+
+    quadrant_top = {quadrant: [] for quadrant in (DO_NOW, PLAN, DELEGATE, ELIMINATE)}
+    for quadrant, name, score in quadrant_rows:
+        quadrant_top[quadrant].append((name, score))
+
+    n = len(top_rows)
+    scores = np.array([row[6] for row in top_rows], dtype=np.float64)
+    top_impact = np.array([row[2] for row in top_rows], dtype=np.int64)
+    top_urgency = np.array([row[3] for row in top_rows], dtype=np.int64)
+    top_effort = np.array([row[4] for row in top_rows], dtype=np.int64)
+    top_alignment = np.array([row[5] for row in top_rows], dtype=np.int64)
+    top = ParetoResult(
+        ids=np.array([row[0] for row in top_rows], dtype=np.int64),
+        names=np.array([row[1] for row in top_rows], dtype=object),
+        impact=top_impact,
+        urgency=top_urgency,
+        effort=top_effort,
+        alignment=top_alignment,
+        scores=scores,
+        score_percentage=scores / total_score * 100 if total_score > 0 else np.zeros(n),
+        cumulative_percentage=np.array([row[7] or 0 for row in top_rows], dtype=np.float64),
+        quadrants=classify_quadrants(top_impact, top_effort),
+        layers=layer_grid[grid_cells(top_impact, top_urgency, top_alignment, top_effort)].astype(np.int64),
+        cutoff=n,
+        total_score=total_score,
+    )
+
+    return ParetoSummary(
+        top=top,
+        vital_count=int(top_rows[0][8]) if top_rows else 0,
+        total_tasks=total_tasks,
+        total_score=total_score,
+        cell_effort=cell_effort,
+        cell_impact=cell_impact,
+        cell_count=cell_count,
+        cell_score=cell_score,
+        cell_urgency=cell_urgency,
+        cell_front_count=cell_front_count,
+        cell_best_layer=cell_best_layer,
+        layer_counts=np.bincount(profile_layers, weights=profile_count)[1:].astype(np.int64),
+        quadrant_counts=quadrant_counts,
+        quadrant_top=quadrant_top,
+        curve_rank=np.array([row[0] for row in curve_rows], dtype=np.int64),
+        curve_percentage=np.array([row[1] or 0 for row in curve_rows], dtype=np.float64),
+    )
+
+
+# Plain JSON-compatible form of a ParetoSummary (stored in pareto_stats.top_tasks)
+def summary_to_dict(summary):
+    top = summary.top
+    return {
+        "vital_count": summary.vital_count,
+        "total_tasks": summary.total_tasks,
+        "total_score": summary.total_score,
+        "top": {
+            "ids": top.ids.tolist(),
+            "names": top.names.tolist(),
+            "impact": top.impact.tolist(),
+            "urgency": top.urgency.tolist(),
+            "effort": top.effort.tolist(),
+            "alignment": top.alignment.tolist(),
+            "scores": top.scores.tolist(),
+            "cumulative_percentage": top.cumulative_percentage.tolist(),
+            "layers": top.layers.tolist(),
+        },
+        "cells": {
+            "effort": summary.cell_effort.tolist(),
+            "impact": summary.cell_impact.tolist(),
+            "count": summary.cell_count.tolist(),
+            "score": summary.cell_score.tolist(),
+            "urgency": summary.cell_urgency.tolist(),
+            "front_count": summary.cell_front_count.tolist(),
+            "best_layer": summary.cell_best_layer.tolist(),
+        },
+        "layer_counts": summary.layer_counts.tolist(),
+        "quadrant_counts": summary.quadrant_counts.tolist(),
+        "quadrant_top": {str(quadrant): rows for quadrant, rows in summary.quadrant_top.items()},
+        "curve": {
+            "rank": summary.curve_rank.tolist(),
+            "percentage": summary.curve_percentage.tolist(),
+        },
+    }
+
+
+# Snapshots stored before Pareto-front layers existed read back with layer 0 (unknown)
+def summary_from_dict(data):
+    top = data["top"]
+    scores = np.array(top["scores"], dtype=np.float64)
+    impact = np.array(top["impact"], dtype=np.int64)
+    effort = np.array(top["effort"], dtype=np.int64)
+    total_score = data["total_score"]
+    cells = data["cells"]
+    no_layers = [0] * len(cells["count"])
+
+    return ParetoSummary(
+        top=ParetoResult(
+            ids=np.array(top["ids"], dtype=np.int64),
+            names=np.array(top["names"], dtype=object),
+            impact=impact,
+            urgency=np.array(top["urgency"], dtype=np.int64),
+            effort=effort,
+            alignment=np.array(top["alignment"], dtype=np.int64),
+            scores=scores,
+            score_percentage=scores / total_score * 100 if total_score > 0 else np.zeros(len(scores)),
+            cumulative_percentage=np.array(top["cumulative_percentage"], dtype=np.float64),
+            quadrants=classify_quadrants(impact, effort),
+            layers=np.array(top.get("layers", [0] * len(scores)), dtype=np.int64),
+            cutoff=len(scores),
+            total_score=total_score,
+        ),
+        vital_count=data["vital_count"],
+        total_tasks=data["total_tasks"],
+        total_score=total_score,
+        cell_effort=np.array(cells["effort"], dtype=np.int64),
+        cell_impact=np.array(cells["impact"], dtype=np.int64),
+        cell_count=np.array(cells["count"], dtype=np.int64),
+        cell_score=np.array(cells["score"], dtype=np.float64),
+        cell_urgency=np.array(cells["urgency"], dtype=np.float64),
+        cell_front_count=np.array(cells.get("front_count", no_layers), dtype=np.int64),
+        cell_best_layer=np.array(cells.get("best_layer", no_layers), dtype=np.int64),
+        layer_counts=np.array(data.get("layer_counts", []), dtype=np.int64),
+        quadrant_counts=np.array(data["quadrant_counts"], dtype=np.int64),
+        quadrant_top={int(quadrant): [tuple(row) for row in rows] for quadrant, rows in data["quadrant_top"].items()},
+        curve_rank=np.array(data["curve"]["rank"], dtype=np.int64),
+        curve_percentage=np.array(data["curve"]["percentage"], dtype=np.float64),
+    )
+
+
+# Calculate Pareto score
+def calculate_pareto_score(impact, urgency, alignment, effort, weights=None):
+    impact_weight, urgency_weight, alignment_weight = weights or DEFAULT_WEIGHTS
+    # Impact and Urgency have positive effects, Effort has negative effect
+    # Strategic alignment has a positive effect
+    value = (impact * impact_weight) + (urgency * urgency_weight) + (alignment * alignment_weight)
+    efficiency = value / effort if effort > 0 else value
+    return efficiency * 10  # Convert to a 0-100 scale
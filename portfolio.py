@@ -0,0 +1,231 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from pareto import PARETO_THRESHOLD, classify_quadrants, score_arrays
+from storage import get_storage
+
+# Portfolios with more tasks than this are ranked in a process pool
+PORTFOLIO_PARALLEL_THRESHOLD = int(os.environ.get("PORTFOLIO_PARALLEL_THRESHOLD", "1000000"))
+
+# Worker processes for large portfolios (defaults to the CPU count)
+PORTFOLIO_WORKERS = int(os.environ.get("PORTFOLIO_WORKERS", "0")) or os.cpu_count() or 1
+
+
+# Pareto analysis of every task of a user across all projects.
+# Task arrays are grouped by project and ranked by score within each project;
+# project_* arrays have one entry per project, in project_ids order.
+@dataclass
+class PortfolioResult:
+    project_ids: np.ndarray
+    project_names: list
+    project_starts: np.ndarray  # offset of each project's first task in the task arrays
+    project_task_count: np.ndarray
+    project_total_score: np.ndarray
+    project_cutoff: np.ndarray  # vital-few task count per project
+    project_quadrant_counts: np.ndarray  # (projects, 4) task counts per quadrant code
+    task_project: np.ndarray  # project id of every task
+    ids: np.ndarray
+    names: np.ndarray
+    scores: np.ndarray
+    quadrants: np.ndarray
+    project_rank: np.ndarray  # 1-based rank within the project
+    project_cumulative_percentage: np.ndarray
+    global_order: np.ndarray  # task positions ordered by score across the whole portfolio
+    global_rank: np.ndarray  # 1-based rank of every task across the whole portfolio
+    global_cumulative_percentage: np.ndarray  # in global_order
+    global_cutoff: int
+    global_quadrant_counts: np.ndarray
+    total_score: float
+
+    def __len__(self):
+        return len(self.scores)
+
+    @property
+    def total_tasks(self):
+        return len(self.scores)
+
+    # Tasks that make up the first PARETO_THRESHOLD percent of the portfolio score
+    @property
+    def top_percentage(self):
+        if self.total_tasks == 0:
+            return 0.0
+        return self.global_cutoff / self.total_tasks * 100
+
+    @property
+    def project_top_percentage(self):
+        return self.project_cutoff / np.maximum(self.project_task_count, 1) * 100
+
+    # Task positions of the vital few in every project
+    def vital_positions(self):
+        return np.flatnonzero(self.project_rank <= np.repeat(self.project_cutoff, self.project_task_count))
+
+
+# Cumulative percentage and vital-few cutoff of score runs that are already sorted within
+# each group; `starts` are the group offsets
+def _group_cumulative(scores, starts):
+    n = len(scores)
+    counts = np.diff(np.append(starts, n))
+    totals = np.add.reduceat(scores, starts) if n else np.zeros(0)
+
+    running = np.cumsum(scores)
+    before_group = np.repeat(running[starts] - scores[starts], counts)
+    group_totals = np.repeat(totals, counts)
+    cumulative = np.divide(
+        (running - before_group) * 100, group_totals,
+        out=np.zeros(n), where=group_totals > 0
+    )
+
+    # Same rule as analyze_arrays: tasks up to the threshold, at least one per group
+    group = np.repeat(np.arange(len(starts)), counts)
+    cutoffs = np.bincount(group, weights=cumulative <= PARETO_THRESHOLD, minlength=len(starts)).astype(np.int64)
+    cutoffs = np.maximum(cutoffs, np.minimum(counts, 1))
+    return cumulative, cutoffs, totals
+
+
+# Rank the tasks of a run of whole projects (input grouped by project) in one pass.
+# Returns the within-project order and its cumulative percentages, relative to the run.
+def _rank_projects(project_ids, ids, scores):
+    # Highest score first within each project, ties newest (highest id) first like the SQL path
+    order = np.lexsort((-ids, -scores, project_ids))
+    sorted_projects = project_ids[order]
+    sorted_scores = scores[order]
+
+    starts = np.zeros(0, dtype=np.int64)
+    if len(order):
+        starts = np.flatnonzero(np.r_[True, sorted_projects[1:] != sorted_projects[:-1]])
+    cumulative, cutoffs, totals = _group_cumulative(sorted_scores, starts)
+    return order, starts, cumulative, cutoffs, totals
+
+
+# Split task positions into about `parts` runs that never cut a project in two
+def _project_chunks(project_ids, parts):
+    n = len(project_ids)
+    boundaries = np.flatnonzero(np.r_[True, project_ids[1:] != project_ids[:-1]])
+    targets = np.linspace(0, n, parts + 1)[1:-1]
+    edges = np.unique(boundaries[np.minimum(np.searchsorted(boundaries, targets), len(boundaries) - 1)])
+    edges = edges[edges > 0]
+    return list(zip(np.r_[0, edges], np.r_[edges, n]))
+
+
+# Per-project ranking, in a process pool for large inputs; input must be grouped by project
+def _rank_all_projects(project_ids, ids, scores, workers):
+    if workers <= 1 or len(scores) <= PORTFOLIO_PARALLEL_THRESHOLD:
+        return _rank_projects(project_ids, ids, scores)
+
+    chunks = _project_chunks(project_ids, workers)
+    # Spawned, not forked: the app process holds threads and pooled connections
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                             mp_context=multiprocessing.get_context("spawn")) as executor:
+        futures = [
+            executor.submit(_rank_projects, project_ids[lo:hi], ids[lo:hi], scores[lo:hi])
+            for lo, hi in chunks
+        ]
+        parts = [future.result() for future in futures]
+
+    offsets = [lo for lo, _ in chunks]
+    return (
+        np.concatenate([part[0] + offset for part, offset in zip(parts, offsets)]),
+        np.concatenate([part[1] + offset for part, offset in zip(parts, offsets)]),
+        np.concatenate([part[2] for part in parts]),
+        np.concatenate([part[3] for part in parts]),
+        np.concatenate([part[4] for part in parts]),
+    )
+
+
+# Score, rank and classify a whole portfolio given as parallel task arrays. Pass the
+# stored scores to rank each project under its own weights; otherwise the defaults apply.
+def analyze_portfolio(project_ids, ids, names, impact, urgency, alignment, effort, project_names=None, workers=None,
+                      scores=None):
+    project_ids = np.asarray(project_ids, dtype=np.int64)
+    ids = np.asarray(ids, dtype=np.int64)
+    names = np.asarray(names, dtype=object)
+    impact = np.asarray(impact)
+    effort = np.asarray(effort)
+    workers = workers or PORTFOLIO_WORKERS
+
+    if scores is None:
+        scores = score_arrays(impact, urgency, alignment, effort)
+    else:
+        scores = np.asarray(scores, dtype=np.float64)
+    quadrants = classify_quadrants(impact, effort)
+
+    # Group by project first (the database returns tasks that way already)
+    if len(project_ids) and np.any(project_ids[1:] < project_ids[:-1]):
+        grouping = np.argsort(project_ids, kind="stable")
+        project_ids, ids, names, scores, quadrants = (
+            project_ids[grouping], ids[grouping], names[grouping], scores[grouping], quadrants[grouping]
+        )
+
+    order, starts, cumulative, cutoffs, totals = _rank_all_projects(project_ids, ids, scores, workers)
+    project_ids, ids, names, scores, quadrants = (
+        project_ids[order], ids[order], names[order], scores[order], quadrants[order]
+    )
+
+    n = len(scores)
+    counts = np.diff(np.append(starts, n))
+    unique_projects = project_ids[starts]
+    project_rank = np.arange(1, n + 1) - np.repeat(starts, counts)
+
+    group = np.repeat(np.arange(len(starts)), counts)
+    project_quadrant_counts = np.bincount(group * 4 + quadrants, minlength=len(starts) * 4).reshape(-1, 4)
+
+    # Global ranking over the same scores
+    global_order = np.lexsort((-ids, -scores))
+    global_rank = np.empty(n, dtype=np.int64)
+    global_rank[global_order] = np.arange(1, n + 1)
+    global_cumulative, global_cutoffs, global_totals = _group_cumulative(
+        scores[global_order], np.zeros(min(n, 1), dtype=np.int64)
+    )
+
+    project_names = project_names or {}
+    return PortfolioResult(
+        project_ids=unique_projects,
+        project_names=[project_names.get(int(p), str(p)) for p in unique_projects],
+        project_starts=starts,
+        project_task_count=counts,
+        project_total_score=totals,
+        project_cutoff=cutoffs,
+        project_quadrant_counts=project_quadrant_counts,
+        task_project=project_ids,
+        ids=ids,
+        names=names,
+        scores=scores,
+        quadrants=quadrants,
+        project_rank=project_rank,
+        project_cumulative_percentage=cumulative,
+        global_order=global_order,
+        global_rank=global_rank,
+        global_cumulative_percentage=global_cumulative,
+        global_cutoff=int(global_cutoffs[0]) if n else 0,
+        global_quadrant_counts=np.bincount(quadrants, minlength=4).astype(np.int64),
+        total_score=float(global_totals[0]) if n else 0.0,
+    )
+
+
+# Portfolio analysis of all of a user's projects: one query for the projects, one for every task
+def get_portfolio_analysis(user_id, workers=None, storage=None):
+    storage = storage or get_storage()
+    projects = storage.get_projects(user_id)
+    rows = storage.get_portfolio_tasks(user_id)
+
+    n = len(rows)
+
+    def column(index, dtype):
+        return np.fromiter((row[index] for row in rows), dtype=dtype, count=n)
+
+    return analyze_portfolio(
+        project_ids=column(0, np.int64),
+        ids=column(1, np.int64),
+        names=np.array([row[2] for row in rows], dtype=object),
+        impact=column(3, np.int64),
+        urgency=column(4, np.int64),
+        alignment=column(6, np.int64),
+        effort=column(5, np.int64),
+        project_names={p["id"]: p["name"] for p in projects},
+        workers=workers,
+        scores=column(7, np.float64),
+    )
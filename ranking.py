@@ -0,0 +1,411 @@
+import os
+import threading
+from bisect import bisect_left, insort
+from collections import OrderedDict
+
+import numpy as np
+
+from pareto import (
+    DEFAULT_WEIGHTS,
+    PARETO_THRESHOLD,
+    SCORE_LEVELS,
+    build_pareto_summary,
+    classify_quadrants,
+    score_arrays,
+)
+
+# Projects whose ranking index is kept in memory, least recently used dropped first
+RANKING_INDEX_MAX_PROJECTS = int(os.environ.get("RANKING_INDEX_MAX_PROJECTS", "256"))
+
+# Highest-ranked tasks each index keeps for the analysis, overall (as many vital-few rows
+# as get_pareto_summary returns by default) and per quadrant
+RANKING_INDEX_TOP_K = int(os.environ.get("RANKING_INDEX_TOP_K", "500"))
+RANKING_INDEX_QUADRANT_TOP_K = int(os.environ.get("RANKING_INDEX_QUADRANT_TOP_K", "20"))
+
+# Every (impact, urgency, alignment, effort) score combination, as 1-based scores
+_CELL_SCORES = np.indices((SCORE_LEVELS,) * 4).reshape(4, -1) + 1
+
+
+# Index of the score combination of a task (or of whole score arrays)
+def score_cell(impact, urgency, alignment, effort):
+    return ((np.asarray(impact, dtype=np.int64) - 1) * SCORE_LEVELS ** 3
+            + (np.asarray(urgency, dtype=np.int64) - 1) * SCORE_LEVELS ** 2
+            + (np.asarray(alignment, dtype=np.int64) - 1) * SCORE_LEVELS
+            + np.asarray(effort, dtype=np.int64) - 1)
+
+
+# Fenwick tree over a fixed number of slots; add and prefix sums are O(log n)
+class FenwickTree:
+    def __init__(self, values):
+        # Linear-time build: every node passes its partial sum on to its parent
+        self._tree = [0] + list(values)
+        self._size = len(values)
+        for i in range(1, self._size + 1):
+            parent = i + (i & -i)
+            if parent <= self._size:
+                self._tree[parent] += self._tree[i]
+
+    def add(self, slot, delta):
+        i = slot + 1
+        while i <= self._size:
+            self._tree[i] += delta
+            i += i & -i
+
+    # Sum of slots [0, slot)
+    def prefix(self, slot):
+        total = 0
+        i = slot
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    # Largest slot count n with accept(sum of slots [0, n)) true, for sums that only grow
+    # with n; returns (n, that sum)
+    def search(self, accept):
+        position, total = 0, 0
+        step = 1 << self._size.bit_length()
+        while step:
+            following = position + step
+            if following <= self._size and accept(total + self._tree[following]):
+                position = following
+                total += self._tree[following]
+            step >>= 1
+        return position, total
+
+
+# (level, -id, cell) keys of the `limit` best tasks, in analysis order (score, then id, descending)
+def _best_tasks(ids, cells, levels, limit):
+    if not len(ids) or limit <= 0:
+        return []
+    # Only tasks down to the level of the limit-th task can make the cut
+    level_counts = np.cumsum(np.bincount(levels))
+    last_level = int(np.searchsorted(level_counts, min(limit, len(ids))))
+    candidates = np.flatnonzero(levels <= last_level)
+    order = candidates[np.lexsort((-ids[candidates], levels[candidates]))][:limit]
+    return list(zip(levels[order].tolist(), (-ids[order]).tolist(), cells[order].tolist()))
+
+
+# Ranking of one project's tasks under fixed weights. Only counts are kept: tasks per
+# score combination, plus Fenwick trees of task counts and score sums per score level
+# (the distinct Pareto scores of the 10^4 combinations, highest first), and the few best
+# tasks overall and per quadrant. Inserts, removals and rescores are O(log n + top_k);
+# rank, cutoff and summary queries never re-sort the project. The kept best tasks are
+# always the best ones, but removing or demoting one of them leaves the list short, and
+# only a rebuild refills it (see complete).
+class RankingIndex:
+    def __init__(self, ids, impact, urgency, alignment, effort, weights=None,
+                 top_k=RANKING_INDEX_TOP_K, quadrant_top_k=RANKING_INDEX_QUADRANT_TOP_K):
+        self.weights = tuple(weights or DEFAULT_WEIGHTS)
+        self.top_k = top_k
+        self.quadrant_top_k = quadrant_top_k
+
+        cell_scores = score_arrays(*_CELL_SCORES, weights=self.weights)
+        levels, cell_level = np.unique(-cell_scores, return_inverse=True)
+        cell_level = cell_level.reshape(-1)
+        cell_quadrant = classify_quadrants(_CELL_SCORES[0], _CELL_SCORES[3])
+        self._cell_scores = cell_scores
+        self._level_scores = (-levels).tolist()
+        self._cell_level = cell_level.tolist()
+        self._cell_quadrant = cell_quadrant.tolist()
+
+        ids = np.asarray(ids, dtype=np.int64)
+        cells = score_cell(impact, urgency, alignment, effort)
+        task_levels = cell_level[cells]
+        self._cell_counts = np.bincount(cells, minlength=SCORE_LEVELS ** 4)
+        level_counts = np.bincount(task_levels, minlength=len(self._level_scores))
+        self._level_counts = level_counts.tolist()
+        self._counts = FenwickTree(self._level_counts)
+        self._sums = FenwickTree((level_counts * np.asarray(self._level_scores)).tolist())
+        self._size = len(ids)
+        # Counted tasks: the build's ids sorted for binary search, then the cell of every
+        # task counted or rescored since (None once removed)
+        order = np.argsort(ids, kind="stable")
+        self._built_ids = ids[order]
+        self._built_cells = cells[order]
+        self._changed = {}
+
+        task_quadrants = cell_quadrant[cells]
+        self._quadrant_sizes = np.bincount(task_quadrants, minlength=4).tolist()
+        self._top = _best_tasks(ids, cells, task_levels, top_k)
+        self._quadrant_top = [
+            _best_tasks(ids[in_quadrant], cells[in_quadrant], task_levels[in_quadrant], quadrant_top_k)
+            for in_quadrant in (task_quadrants == quadrant for quadrant in range(4))
+        ]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    # Whether a task is counted
+    def includes(self, task_id):
+        with self._lock:
+            return self._cell_of(task_id) is not None
+
+    # Whether the kept best tasks still fill their limits; if not, the summary would list
+    # fewer tasks than it should and the index needs a rebuild
+    def complete(self):
+        with self._lock:
+            return len(self._top) >= min(self.top_k, self._size) and all(
+                len(best) >= min(self.quadrant_top_k, size)
+                for best, size in zip(self._quadrant_top, self._quadrant_sizes)
+            )
+
+    # Count a new task; returns False for tasks already counted
+    def add(self, task_id, impact, urgency, alignment, effort):
+        cell = int(score_cell(impact, urgency, alignment, effort))
+        with self._lock:
+            if self._cell_of(task_id) is not None:
+                return False
+            self._count(task_id, cell)
+            return True
+
+    # Stop counting a task; returns False for tasks not counted
+    def remove(self, task_id):
+        with self._lock:
+            cell = self._cell_of(task_id)
+            if cell is None:
+                return False
+            self._uncount(task_id, cell)
+            self._changed[task_id] = None
+            return True
+
+    # Move a counted task to new scores; returns False for tasks not counted
+    def update(self, task_id, impact, urgency, alignment, effort):
+        cell = int(score_cell(impact, urgency, alignment, effort))
+        with self._lock:
+            previous = self._cell_of(task_id)
+            if previous is None:
+                return False
+            if previous != cell:
+                self._uncount(task_id, previous)
+                self._count(task_id, cell)
+            return True
+
+    # Called with the lock held; cell of a counted task, else None
+    def _cell_of(self, task_id):
+        if task_id in self._changed:
+            return self._changed[task_id]
+        i = int(np.searchsorted(self._built_ids, task_id))
+        if i < len(self._built_ids) and self._built_ids[i] == task_id:
+            return int(self._built_cells[i])
+        return None
+
+    # Called with the lock held
+    def _count(self, task_id, cell):
+        level = self._cell_level[cell]
+        quadrant = self._cell_quadrant[cell]
+        key = (level, -task_id, cell)
+        self._keep(self._top, key, self.top_k, self._size)
+        self._keep(self._quadrant_top[quadrant], key, self.quadrant_top_k, self._quadrant_sizes[quadrant])
+
+        self._size += 1
+        self._quadrant_sizes[quadrant] += 1
+        self._cell_counts[cell] += 1
+        self._level_counts[level] += 1
+        self._counts.add(level, 1)
+        self._sums.add(level, self._level_scores[level])
+        self._changed[task_id] = cell
+
+    # Called with the lock held
+    def _uncount(self, task_id, cell):
+        level = self._cell_level[cell]
+        quadrant = self._cell_quadrant[cell]
+        key = (level, -task_id, cell)
+        self._discard(self._top, key)
+        self._discard(self._quadrant_top[quadrant], key)
+
+        self._size -= 1
+        self._quadrant_sizes[quadrant] -= 1
+        self._cell_counts[cell] -= 1
+        self._level_counts[level] -= 1
+        self._counts.add(level, -1)
+        self._sums.add(level, -self._level_scores[level])
+
+    # Called with the lock held; `others` is the number of other tasks the list ranks.
+    # A key past the end only joins a list holding all of them, so the list stays the
+    # best tasks even after removals shortened it. Lists never grow past their limit.
+    @staticmethod
+    def _keep(best, key, limit, others):
+        if len(best) == others or (best and key < best[-1]):
+            insort(best, key)
+            del best[limit:]
+
+    # Called with the lock held
+    @staticmethod
+    def _discard(best, key):
+        i = bisect_left(best, key)
+        if i < len(best) and best[i] == key:
+            del best[i]
+
+    # Pareto score of a score combination under the index's weights
+    def score(self, impact, urgency, alignment, effort):
+        return float(self._cell_scores[int(score_cell(impact, urgency, alignment, effort))])
+
+    # 1-based rank of the newest task with these scores (ties rank newest first)
+    def rank(self, impact, urgency, alignment, effort):
+        level = self._cell_level[int(score_cell(impact, urgency, alignment, effort))]
+        with self._lock:
+            return self._counts.prefix(level) + 1
+
+    # Number of tasks making up the first PARETO_THRESHOLD percent of the total score
+    # (the vital few), computed like analyze_arrays: at least one task when any exist
+    def cutoff(self):
+        with self._lock:
+            return self._cutoff()
+
+    # Called with the lock held
+    def _cutoff(self):
+        total = self._sums.prefix(len(self._level_scores))
+        if not total or not self._size:
+            return 0
+
+        def within(score_sum):
+            return score_sum / total * 100 <= PARETO_THRESHOLD
+
+        # Whole levels inside the threshold, then the tasks of the next level that still fit
+        level, score_sum = self._sums.search(within)
+        count = self._counts.prefix(level)
+        if level < len(self._level_scores):
+            score = self._level_scores[level]
+            remaining = self._level_counts[level]
+            fitting = min(remaining, max(0, int((total * PARETO_THRESHOLD / 100 - score_sum) // score)))
+            while fitting < remaining and within(score_sum + (fitting + 1) * score):
+                fitting += 1
+            while fitting > 0 and not within(score_sum + fitting * score):
+                fitting -= 1
+            count += fitting
+        return max(count, 1)
+
+    # Called with the lock held; cumulative score percentage of the first `rank` tasks
+    def _cumulative_percentage(self, rank, total):
+        level, count = self._counts.search(lambda before: before < rank)
+        score_sum = self._sums.prefix(level) + (rank - count) * self._level_scores[level]
+        return score_sum / total * 100
+
+    # ParetoSummary of the project, shaped like database.get_pareto_summary: the vital
+    # few (up to top_k rows), per-combination totals, quadrant leaders and a sampled
+    # cumulative curve. Only the names of the listed tasks are fetched.
+    def summary(self, fetch_names, curve_points=200):
+        with self._lock:
+            total = self._sums.prefix(len(self._level_scores))
+            vital_count = self._cutoff()
+            top = self._top[:vital_count]
+            quadrant_top = [list(best) for best in self._quadrant_top]
+
+            # Same sample as the SQL summary, plus the exact cutoff point
+            step = max(self._size // curve_points, 1)
+            ranks = {1, self._size, vital_count, *range(step, self._size + 1, step)}
+            curve_rows = [
+                (rank, self._cumulative_percentage(rank, total)) for rank in sorted(ranks)
+            ] if total and self._size else []
+
+            cells = np.flatnonzero(self._cell_counts)
+            counts = self._cell_counts[cells]
+
+        profile_rows = np.column_stack([*_CELL_SCORES[:, cells], counts, counts * self._cell_scores[cells]])
+
+        names = fetch_names([-key[1] for key in top] + [-key[1] for best in quadrant_top for key in best])
+        top_rows = []
+        score_sum = 0.0
+        for rank, (level, negative_id, cell) in enumerate(top, 1):
+            impact, urgency, alignment, effort = _CELL_SCORES[:, cell].tolist()
+            score = self._level_scores[level]
+            score_sum += score
+            top_rows.append((-negative_id, names.get(-negative_id, ""), impact, urgency, effort, alignment,
+                             score, score_sum / total * 100, vital_count, rank))
+        quadrant_rows = [
+            (quadrant, names.get(-negative_id, ""), self._level_scores[level])
+            for quadrant, best in enumerate(quadrant_top) for level, negative_id, _ in best
+        ]
+        return build_pareto_summary(top_rows, profile_rows, quadrant_rows, curve_rows)
+
+
+# Ranking indexes of recently used projects. An index is built from task columns the
+# analysis has already read (its cold start) and then counts inserts, removals and
+# rescores as they are notified, without touching storage. A project whose task count or
+# weights no longer match (bulk imports, weight changes, other processes), or whose index
+# lost some of its kept best tasks, is rebuilt by its next analysis.
+class RankingIndexes:
+    def __init__(self, max_projects=256):
+        self.max_projects = max_projects
+
+        self._lock = threading.Lock()
+        self._indexes = OrderedDict()  # project_id -> RankingIndex
+        self._builds = 0
+        self._updates = 0
+
+    # Loaded index of a project if it matches the (task count, last update) version and
+    # weights the caller read, else None
+    def get(self, project_id, version, weights):
+        if not version or not version[0]:
+            return None
+        with self._lock:
+            index = self._indexes.get(project_id)
+            if index is None or len(index) != version[0] or index.weights != tuple(weights or DEFAULT_WEIGHTS):
+                return None
+            if not index.complete():
+                return None
+            self._indexes.move_to_end(project_id)
+            return index
+
+    # Build and keep a project's index from its get_task_columns output
+    def build(self, project_id, columns, weights):
+        if not len(columns[0]):
+            self.invalidate(project_id)
+            return None
+        index = RankingIndex(*columns, weights=weights)
+        with self._lock:
+            self._builds += 1
+            self._indexes[project_id] = index
+            self._indexes.move_to_end(project_id)
+            while len(self._indexes) > self.max_projects:
+                self._indexes.popitem(last=False)
+        return index
+
+    # Loaded index of a project as it stands, for the write path (no storage reads)
+    def peek(self, project_id):
+        with self._lock:
+            return self._indexes.get(project_id)
+
+    # Task insert listener: count the task in the project's index if it is loaded
+    def task_added(self, project_id, task_id, impact, urgency, alignment, effort):
+        index = self.peek(project_id)
+        if index is not None and index.add(task_id, impact, urgency, alignment, effort):
+            with self._lock:
+                self._updates += 1
+
+    # Stop counting a deleted task in the project's index if it is loaded
+    def task_removed(self, project_id, task_id):
+        index = self.peek(project_id)
+        if index is not None and index.remove(task_id):
+            with self._lock:
+                self._updates += 1
+
+    # Move a rescored task in the project's index if it is loaded
+    def task_updated(self, project_id, task_id, impact, urgency, alignment, effort):
+        index = self.peek(project_id)
+        if index is not None and index.update(task_id, impact, urgency, alignment, effort):
+            with self._lock:
+                self._updates += 1
+
+    def invalidate(self, project_id):
+        with self._lock:
+            self._indexes.pop(project_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._indexes.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "projects": len(self._indexes),
+                "tasks": sum(len(index) for index in self._indexes.values()),
+                "builds": self._builds,
+                "updates": self._updates,
+            }
+
+
+# Shared ranking indexes, keyed by project id
+ranking_indexes = RankingIndexes(max_projects=RANKING_INDEX_MAX_PROJECTS)
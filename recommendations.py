@@ -0,0 +1,97 @@
+import os
+
+import numpy as np
+
+from pareto import DELEGATE, DO_NOW, ELIMINATE, PLAN, ParetoResult, ParetoSummary, analyze_tasks
+
+# Tasks listed per report section; the rest are summarized as "...and N more"
+RECOMMENDATION_TOP_N = int(os.environ.get("RECOMMENDATION_TOP_N", "20"))
+
+# Report sections, one per quadrant code
+QUADRANT_SECTIONS = (
+    (DO_NOW, "### ✅ DO NOW (High Impact, Low Effort)"),
+    (PLAN, "### 📅 PLAN (High Impact, High Effort)"),
+    (DELEGATE, "### 👥 DELEGATE (Low Impact, Low Effort)"),
+    (ELIMINATE, "### ❌ ELIMINATE (Low Impact, High Effort)"),
+)
+
+
+# Top-N view of an analysis: (total, vital count, vital %, [(name, score)] of the vital few,
+# {quadrant: [names]}, per-quadrant counts); lists are ordered by score
+def _recommendation_view(tasks, top_n):
+    if isinstance(tasks, ParetoSummary):
+        top = tasks.top
+        shown = min(top_n, len(top))
+        priority = list(zip(top.names[:shown], top.scores[:shown]))
+        quadrant_names = {quadrant: [name for name, _ in rows[:top_n]] for quadrant, rows in tasks.quadrant_top.items()}
+        return (tasks.total_tasks, tasks.vital_count, tasks.top_percentage, priority, quadrant_names,
+                tasks.quadrant_counts, tasks.layer_counts)
+
+    result = tasks if isinstance(tasks, ParetoResult) else analyze_tasks(tasks)
+    shown = min(top_n, result.cutoff)
+    priority = list(zip(result.names[:shown], result.scores[:shown]))
+    quadrant_names = {
+        quadrant: result.names[result.quadrant_positions(quadrant)[:top_n]].tolist()
+        for quadrant, _ in QUADRANT_SECTIONS
+    }
+    return (result.total_tasks, result.cutoff, result.top_percentage, priority, quadrant_names,
+            result.quadrant_counts, result.layer_counts)
+
+
+# Ranked positions of a ParetoResult whose names the report shows
+def recommendation_positions(result, top_n=None):
+    top_n = RECOMMENDATION_TOP_N if top_n is None else top_n
+    return np.concatenate([np.arange(min(top_n, result.cutoff))] + [
+        result.quadrant_positions(quadrant)[:top_n] for quadrant, _ in QUADRANT_SECTIONS
+    ])
+
+
+# Prioritization report as markdown sections (summary, priority list, one per quadrant);
+# shared by the Gradio app and the headless batch analysis
+def iter_recommendations(tasks, top_n=None):
+    if not tasks:
+        yield "No tasks added yet. Add tasks to get priority recommendations."
+        return
+
+    top_n = RECOMMENDATION_TOP_N if top_n is None else top_n
+    (total_tasks, vital_count, percentage, priority, quadrant_names, quadrant_counts,
+     layer_counts) = _recommendation_view(tasks, top_n)
+
+    lines = [
+        "# 📊 Pareto Principle Analysis",
+        "",
+        "## 🔍 Summary",
+        f"Out of {total_tasks} tasks, only {vital_count} tasks ({percentage:.1f}%) generate 80% of results.",
+    ]
+    if len(layer_counts):
+        lines.extend([
+            "",
+            f"{layer_counts[0]} tasks are on the Pareto front (◇ in the quadrant chart): no other task is at least "
+            f"as good on impact, urgency, alignment and effort while better on one. "
+            f"The remaining tasks form {len(layer_counts) - 1} further front layers.",
+        ])
+    yield "\n".join(lines)
+
+    lines = ["## 🎯 Priority Tasks", "You should dedicate most of your time to these tasks:", ""]
+    lines.extend(f"{i}. **{name}** (Pareto Score: {score:.1f})" for i, (name, score) in enumerate(priority, 1))
+    if vital_count > len(priority):
+        lines.extend(["", f"...and {vital_count - len(priority)} more."])
+    lines.extend(["", "## 📋 Action Plan"])
+    yield "\n".join(lines)
+
+    for quadrant, heading in QUADRANT_SECTIONS:
+        names = quadrant_names[quadrant]
+        lines = [heading, ""]
+        if names:
+            lines.extend(f"- **{name}**" for name in names)
+            remaining = int(quadrant_counts[quadrant]) - len(names)
+            if remaining > 0:
+                lines.append(f"- ...and {remaining} more")
+        else:
+            lines.append("- No tasks found in this category.")
+        yield "\n".join(lines)
+
+
+# Prioritization recommendations
+def get_recommendations(tasks, top_n=None):
+    return "\n\n".join(iter_recommendations(tasks, top_n))
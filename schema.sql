@@ -16,7 +16,10 @@ CREATE TABLE IF NOT EXISTS projects (
     description TEXT,
     is_active BOOLEAN NOT NULL DEFAULT TRUE,
     created_at TIMESTAMP NOT NULL DEFAULT NOW(),
-    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    impact_weight DOUBLE PRECISION NOT NULL DEFAULT 0.4,
+    urgency_weight DOUBLE PRECISION NOT NULL DEFAULT 0.3,
+    alignment_weight DOUBLE PRECISION NOT NULL DEFAULT 0.3
 );
 
 -- Görevler tablosu
@@ -29,6 +32,7 @@ CREATE TABLE IF NOT EXISTS tasks (
     urgency_score INTEGER NOT NULL CHECK (urgency_score BETWEEN 1 AND 10),
     effort_score INTEGER NOT NULL CHECK (effort_score BETWEEN 1 AND 10),
     alignment_score INTEGER NOT NULL CHECK (alignment_score BETWEEN 1 AND 10),
+    pareto_score DOUBLE PRECISION,
     status VARCHAR(50) NOT NULL DEFAULT 'PENDING',
     due_date DATE,
     created_at TIMESTAMP NOT NULL DEFAULT NOW(),
@@ -71,18 +75,58 @@ CREATE TABLE IF NOT EXISTS pareto_stats (
     top_tasks JSONB NOT NULL,
     total_tasks INTEGER NOT NULL,
     efficiency_score FLOAT NOT NULL,
+    source_task_count INTEGER,
+    source_updated_at TIMESTAMP,
     created_at TIMESTAMP NOT NULL DEFAULT NOW()
 );
 
 -- İndeksler
 CREATE INDEX IF NOT EXISTS idx_projects_user_id ON projects(user_id);
 CREATE INDEX IF NOT EXISTS idx_tasks_project_id ON tasks(project_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_project_pareto_score ON tasks(project_id, pareto_score DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_tasks_project_created ON tasks(project_id, created_at DESC, id DESC);
 CREATE INDEX IF NOT EXISTS idx_task_tags_task_id ON task_tags(task_id);
-CREATE INDEX IF NOT EXISTS idx_task_tags_tag_id ON task_tags(tag_id);
+CREATE INDEX IF NOT EXISTS idx_task_tags_tag_task ON task_tags(tag_id, task_id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_tags_name ON tags(name);
 CREATE INDEX IF NOT EXISTS idx_activity_log_user_id ON activity_log(user_id);
 CREATE INDEX IF NOT EXISTS idx_pareto_stats_project_id ON pareto_stats(project_id);
+CREATE INDEX IF NOT EXISTS idx_pareto_stats_project_date ON pareto_stats(project_id, analysis_date DESC);
+
+-- Görev Pareto puanı, projenin ağırlıklarıyla hesaplanır
+CREATE OR REPLACE FUNCTION set_task_pareto_score() RETURNS trigger AS $$
+BEGIN
+    SELECT (NEW.impact_score * p.impact_weight + NEW.urgency_score * p.urgency_weight
+            + NEW.alignment_score * p.alignment_weight) / NEW.effort_score * 10
+    INTO NEW.pareto_score
+    FROM projects p
+    WHERE p.id = NEW.project_id;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tasks_pareto_score ON tasks;
+CREATE TRIGGER tasks_pareto_score
+BEFORE INSERT OR UPDATE OF project_id, impact_score, urgency_score, effort_score, alignment_score ON tasks
+FOR EACH ROW EXECUTE FUNCTION set_task_pareto_score();
 
 -- Demo kullanıcı oluştur
 INSERT INTO users (username, email, password_hash)
 VALUES ('demo_user', 'demo@example.com', 'demo_password_hash')
-ON CONFLICT (username) DO NOTHING;
\ No newline at end of file
+ON CONFLICT (username) DO NOTHING;
+
+-- Uygulanan migration sürümleri (migrations/ klasörü ile aynı sonucu verir)
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+INSERT INTO schema_migrations (version, name) VALUES
+    (1, 'initial_schema'),
+    (2, 'task_pareto_score'),
+    (3, 'task_keyset_index'),
+    (4, 'pareto_stats_source_version'),
+    (5, 'task_tag_filters'),
+    (6, 'project_score_weights'),
+    (7, 'pareto_score_tie_break')
+ON CONFLICT (version) DO NOTHING;
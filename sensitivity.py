@@ -0,0 +1,242 @@
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+from pareto import DEFAULT_WEIGHTS, PARETO_THRESHOLD
+
+# Weight vectors sampled per sensitivity run
+SENSITIVITY_SAMPLES = int(os.environ.get("SENSITIVITY_SAMPLES", "5000"))
+
+# Dirichlet concentration around the project's weights: higher keeps samples closer
+# to them; 0 samples uniformly over all weight vectors
+SENSITIVITY_CONCENTRATION = float(os.environ.get("SENSITIVITY_CONCENTRATION", "30"))
+
+# Score difference, relative to the highest score, below which two score profiles count as tied
+TIE_TOLERANCE = 1e-9
+
+# Samples ranked per batch; small batches keep the (batch, profiles) work arrays in cache
+SENSITIVITY_BATCH_SIZE = int(os.environ.get("SENSITIVITY_BATCH_SIZE", "32"))
+
+# Profiles summed at a time while looking for the vital-few boundary
+MASS_BLOCK = 64
+
+
+# How a ranking holds up when the score weights move. Arrays have one entry per input
+# row (a task, or a score profile standing for `counts` tasks), in input order.
+@dataclass
+class SensitivityResult:
+    weights: np.ndarray  # (samples, 3) sampled (impact, urgency, alignment) weights
+    base_weights: tuple
+    counts: np.ndarray  # tasks each row stands for
+    base_rank: np.ndarray  # rank under the base weights (1 = best; tied tasks share a rank)
+    vital_frequency: np.ndarray  # share of samples placing the row in the vital few
+    mean_rank: np.ndarray
+    rank_std: np.ndarray
+
+    def __len__(self):
+        return len(self.base_rank)
+
+    @property
+    def samples(self):
+        return len(self.weights)
+
+    @property
+    def total_tasks(self):
+        return int(self.counts.sum())
+
+
+# Weight vectors on the simplex, centered on base; the first row is base itself.
+# Weights that are zero in base stay zero unless sampling is uniform.
+def sample_weights(samples, base=None, concentration=None, seed=0):
+    base = np.asarray(base or DEFAULT_WEIGHTS, dtype=np.float64)
+    base = base / base.sum()
+    concentration = SENSITIVITY_CONCENTRATION if concentration is None else concentration
+
+    rng = np.random.default_rng(seed)
+    weights = np.zeros((max(samples - 1, 0), 3))
+    if concentration > 0:
+        positive = base > 0
+        weights[:, positive] = rng.dirichlet(base[positive] * concentration, size=len(weights))
+    else:
+        weights[:] = rng.dirichlet(np.ones(3), size=len(weights))
+    return np.vstack([base, weights])
+
+
+# Distinct score profiles: tasks whose (impact, urgency, alignment) / effort are
+# proportional score the same under every weight vector, so they are ranked once
+def _profiles(impact, urgency, alignment, effort, counts):
+    scores = np.stack([impact, urgency, alignment, effort], axis=1).astype(np.int64)
+    scores //= np.gcd.reduce(scores, axis=1)[:, None]
+    keys, inverse = np.unique(scores, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    profile_counts = np.bincount(inverse, weights=counts, minlength=len(keys))
+    # Per-task value vector: score = weights @ value
+    values = keys[:, :3] / keys[:, 3:4] * 10
+    return values, profile_counts, inverse
+
+
+# Scratch arrays for ranking up to `batch` weight vectors over k profiles, reused across
+# batches: fresh (batch, k) arrays cost more in page faults than the work done on them
+def _workspace(batch, k):
+    floats = np.empty((4, batch, k))
+    return (*floats, np.empty((batch, k), dtype=np.int64), np.empty((batch, k), dtype=bool))
+
+
+# Position of the first profile in each row (highest score first) whose cumulative score,
+# score times count, passes `share` of the row's total, with the cumulative score there and
+# the total. Blocks of profiles are summed first, so only the block holding the position is
+# summed profile by profile.
+def _threshold_position(scores, counts, share):
+    rows = np.arange(len(scores))
+    k = scores.shape[1]
+    full = k - k % MASS_BLOCK
+    blocks = (len(scores), full // MASS_BLOCK, MASS_BLOCK)
+    block_mass = np.empty((len(scores), -(-k // MASS_BLOCK)))
+    np.einsum("ijk,ijk->ij", scores[:, :full].reshape(blocks), counts[:, :full].reshape(blocks),
+              out=block_mass[:, :blocks[1]])
+    if full < k:
+        block_mass[:, -1] = np.einsum("ij,ij->i", scores[:, full:], counts[:, full:])
+    np.cumsum(block_mass, axis=1, out=block_mass)
+    total = block_mass[:, -1]
+    # The slack absorbs the index bits written into the scores
+    limit = total * share * (1 + 1e-11)
+
+    block = np.argmax(block_mass > limit[:, None], axis=1)
+    columns = block[:, None] * MASS_BLOCK + np.arange(MASS_BLOCK)
+    clamped = np.minimum(columns, k - 1)
+    within = np.where(columns < k, scores[rows[:, None], clamped] * counts[rows[:, None], clamped], 0)
+    cumulative = np.cumsum(within, axis=1)
+    cumulative += np.where(block > 0, block_mass[rows, block - 1], 0)[:, None]
+    passed = cumulative > limit[:, None]
+    passed[:, -1] = True
+    offset = np.argmax(passed, axis=1)
+    return clamped[rows, offset], cumulative[rows, offset], total
+
+
+# Rank statistics of one batch of weight vectors over the profiles.
+# Returns per-profile (vital share sum, rank sum, squared rank sum) over the batch.
+def _rank_batch(weights, counts, negated_values, workspace):
+    rows = np.arange(len(weights))
+    k = negated_values.shape[1]
+    scores, sorted_counts, starts, ranks, order, below = (array[:len(weights)] for array in workspace)
+
+    # Highest score first, from a plain sort of the negated scores with each profile's index
+    # written over their low mantissa bits: far cheaper than an argsort, and the scores move
+    # by less than 2^-38 of their value, well inside the tie tolerance
+    index_mask = (1 << max(k - 1, 1).bit_length()) - 1
+    np.matmul(weights, negated_values, out=scores)
+    bits = scores.view(np.int64)
+    bits &= ~index_mask
+    bits |= np.arange(k)
+    scores.sort(axis=1)
+    np.bitwise_and(bits, index_mask, out=order)
+    np.negative(scores, out=scores)
+
+    # Rows where some neighbouring scores are within the tie tolerance
+    tie_limit = scores[:, :1] * TIE_TOLERANCE
+    gaps = np.subtract(scores[:, :-1], scores[:, 1:], out=ranks[:, :-1])
+    tied_rows = np.flatnonzero(gaps.min(axis=1, initial=np.inf) <= tie_limit[:, 0])
+    ties = gaps[tied_rows] <= tie_limit[tied_rows]
+
+    np.take(counts, order, out=sorted_counts, mode="clip")
+    np.cumsum(sorted_counts, axis=1, out=starts)
+    starts -= sorted_counts
+
+    # The vital few end inside the first profile whose cumulative score passes the
+    # threshold; that profile's tasks are in up to the threshold, at least one task overall
+    boundary, boundary_mass, total = _threshold_position(scores, sorted_counts, PARETO_THRESHOLD / 100)
+    limit = total * (PARETO_THRESHOLD / 100)
+    boundary_profile = order[rows, boundary]
+    boundary_score = scores[rows, boundary]
+    boundary_count = sorted_counts[rows, boundary]
+    boundary_start = starts[rows, boundary]
+    inside = np.floor((limit - (boundary_mass - boundary_score * boundary_count)) / boundary_score + 1e-9)
+    inside = np.clip(inside, 0, boundary_count)
+    cutoff = np.maximum(boundary_start + inside, 1)
+
+    # Profiles whose scores only differ by rounding are tied: tied tasks share the rank of
+    # the first of them and split the vital-few places left in their group evenly. Ties
+    # between profiles are rare outside round weight vectors, so only those rows are regrouped.
+    vital_sum = np.zeros(k)
+    if len(tied_rows):
+        ends = starts[tied_rows] + sorted_counts[tied_rows]
+        tie_breaks = np.ones((len(tied_rows), k), dtype=bool)
+        tie_breaks[:, 1:] = ~ties
+        tied_starts = np.maximum.accumulate(np.where(tie_breaks, starts[tied_rows], 0), axis=1)
+        group_ends = np.where(np.roll(tie_breaks, -1, axis=1), ends, np.inf)
+        group_ends[:, -1] = ends[:, -1]
+        tied_ends = np.minimum.accumulate(group_ends[:, ::-1], axis=1)[:, ::-1]
+        starts[tied_rows] = tied_starts
+
+        # Only the leading columns, where some row still has vital places, can get a share
+        tied_cutoff = cutoff[tied_rows, None]
+        vital_columns = int(np.count_nonzero(tied_starts < tied_cutoff, axis=1).max())
+        vital = np.clip((tied_cutoff - tied_starts[:, :vital_columns])
+                        / (tied_ends - tied_starts)[:, :vital_columns], 0, 1)
+        vital_sum += np.bincount(order[tied_rows, :vital_columns].ravel(), weights=vital.ravel(), minlength=k)
+
+    # Ranks back in profile order
+    order += (rows * k)[:, None]
+    ranks.ravel()[order.ravel()] = starts.ravel()
+
+    # Without ties, the profiles ranked before the boundary are wholly vital and the
+    # boundary profile gets the places left at the cutoff
+    untied = np.ones(len(weights), dtype=bool)
+    untied[tied_rows] = False
+    np.less(ranks, np.where(untied, boundary_start, 0)[:, None], out=below)
+    vital_sum += np.count_nonzero(below, axis=0)
+    np.add.at(vital_sum, boundary_profile[untied],
+              np.clip((cutoff - boundary_start) / boundary_count, 0, 1)[untied])
+
+    # Ranks are 1-based: (r + 1) summed is r summed plus one per row, and likewise squared
+    rank_sum = ranks.sum(axis=0)
+    rank_sq_sum = np.einsum("ij,ij->j", ranks, ranks) + 2 * rank_sum + len(weights)
+    return vital_sum, rank_sum + len(weights), rank_sq_sum
+
+
+# Rank every row under `samples` weight vectors at once. Scores of all samples come
+# from one (samples x 3) @ (3 x profiles) product per batch; at most 10^4 profiles
+# exist whatever the task count, so the cost does not grow with the project.
+def weight_sensitivity(impact, urgency, alignment, effort, counts=None, base_weights=None, samples=None,
+                       concentration=None, seed=0):
+    n = len(impact)
+    counts = np.ones(n) if counts is None else np.asarray(counts, dtype=np.float64)
+    base_weights = tuple(base_weights or DEFAULT_WEIGHTS)
+    weights = sample_weights(SENSITIVITY_SAMPLES if samples is None else samples, base_weights, concentration, seed)
+    if n == 0:
+        empty = np.zeros(0)
+        return SensitivityResult(weights, base_weights, counts, empty.astype(np.int64), empty, empty, empty)
+
+    values, profile_counts, inverse = _profiles(impact, urgency, alignment, effort, counts)
+    # Profiles in base-rank order: each sample's ranking is then close to that order, so
+    # the gathers and scatters along it touch memory nearly in sequence
+    base_order = np.argsort(values @ -weights[0])
+    values, profile_counts = values[base_order], profile_counts[base_order]
+    inverse = np.argsort(base_order)[inverse]
+
+    negated_values = np.ascontiguousarray(-values.T)
+    workspace = _workspace(min(SENSITIVITY_BATCH_SIZE, len(weights)), len(values))
+    vital_sum = np.zeros(len(values))
+    rank_sum = np.zeros(len(values))
+    rank_sq_sum = np.zeros(len(values))
+    for lo in range(0, len(weights), SENSITIVITY_BATCH_SIZE):
+        batch_vital, batch_rank, batch_rank_sq = _rank_batch(
+            weights[lo:lo + SENSITIVITY_BATCH_SIZE], profile_counts, negated_values, workspace
+        )
+        vital_sum += batch_vital
+        rank_sum += batch_rank
+        rank_sq_sum += batch_rank_sq
+
+    base_rank = _rank_batch(weights[:1], profile_counts, negated_values, workspace)[1]
+    mean_rank = rank_sum / len(weights)
+    rank_std = np.sqrt(np.maximum(rank_sq_sum / len(weights) - mean_rank ** 2, 0))
+    return SensitivityResult(
+        weights=weights,
+        base_weights=base_weights,
+        counts=counts,
+        base_rank=base_rank[inverse].astype(np.int64),
+        vital_frequency=(vital_sum / len(weights))[inverse],
+        mean_rank=mean_rank[inverse],
+        rank_std=rank_std[inverse],
+    )
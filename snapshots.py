@@ -0,0 +1,96 @@
+import os
+import threading
+
+from pareto import summary_to_dict
+
+# Seconds between refresh passes over projects whose tasks changed
+SNAPSHOT_REFRESH_INTERVAL = float(os.environ.get("SNAPSHOT_REFRESH_INTERVAL", "30"))
+
+# Seconds between full scans for stale snapshots (catches writes made by other processes)
+SNAPSHOT_FULL_SCAN_INTERVAL = float(os.environ.get("SNAPSHOT_FULL_SCAN_INTERVAL", "600"))
+
+# Only projects with more tasks than this are served from snapshots, so only they are
+# covered by the full scan (same setting as the app)
+SERVER_SIDE_ANALYSIS_THRESHOLD = int(os.environ.get("SERVER_SIDE_ANALYSIS_THRESHOLD", "5000"))
+
+
+# Compute a project's Pareto summary in the database and store it as a snapshot.
+# Snapshots are PostgreSQL only, so database.py (it needs psycopg2) is imported here.
+def snapshot_project(project_id):
+    import database
+
+    # Read the version first: a write that lands during the analysis leaves the snapshot stale, not wrong
+    version = database.get_task_version(project_id)
+    if not version or version[0] == 0:
+        return None
+
+    summary = database.get_pareto_summary(project_id)
+    if summary is None:
+        return None
+
+    database.save_pareto_snapshot(project_id, summary_to_dict(summary), summary.total_tasks, summary.top_percentage, version)
+    return summary
+
+
+# Background thread that keeps pareto_stats snapshots up to date
+class SnapshotRefresher:
+    def __init__(self, interval=30.0, full_scan_interval=600.0, full_scan_min_tasks=0):
+        self.interval = interval
+        self.full_scan_interval = full_scan_interval
+        self.full_scan_min_tasks = full_scan_min_tasks
+
+        self._lock = threading.Lock()
+        self._dirty = set()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # Task change listener: the project is refreshed on the next pass
+    def mark_dirty(self, project_id):
+        with self._lock:
+            self._dirty.add(project_id)
+
+    def refresh_once(self, full_scan=False):
+        with self._lock:
+            project_ids, self._dirty = self._dirty, set()
+
+        if full_scan:
+            import database
+            project_ids.update(database.get_stale_snapshot_projects(self.full_scan_min_tasks))
+
+        refreshed = 0
+        for project_id in project_ids:
+            try:
+                if snapshot_project(project_id) is not None:
+                    refreshed += 1
+            except Exception as e:
+                print(f"Error refreshing snapshot for project {project_id}: {e}")
+        return refreshed
+
+    def _run(self):
+        passes_per_scan = max(1, round(self.full_scan_interval / self.interval))
+        passes = 0
+        while True:
+            self.refresh_once(full_scan=passes % passes_per_scan == 0)
+            passes += 1
+            if self._stop.wait(self.interval):
+                return
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="snapshot-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+# Shared refresher used by the app
+snapshot_refresher = SnapshotRefresher(
+    interval=SNAPSHOT_REFRESH_INTERVAL,
+    full_scan_interval=SNAPSHOT_FULL_SCAN_INTERVAL,
+    full_scan_min_tasks=SERVER_SIDE_ANALYSIS_THRESHOLD,
+)
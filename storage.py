@@ -0,0 +1,955 @@
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import date, datetime, timezone
+
+import numpy as np
+
+from activity import activity_logger
+from events import notify_projects_changed, notify_task_added, notify_tasks_changed
+from metrics import instrument_query
+from pareto import ALIGNMENT_WEIGHT, DEFAULT_WEIGHTS, IMPACT_WEIGHT, URGENCY_WEIGHT, calculate_pareto_score
+
+# Storage backend: "postgres" (default), "sqlite" (embedded file) or "memory"
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "postgres")
+
+# SQLite database file and how long a write waits for the file lock, in seconds
+SQLITE_PATH = os.environ.get("SQLITE_PATH", "prioritylens.db")
+SQLITE_BUSY_TIMEOUT = float(os.environ.get("SQLITE_BUSY_TIMEOUT", "5"))
+
+DEMO_USER = ("demo_user", "demo@example.com", "demo_password_hash")
+
+# Rows fetched per round-trip when streaming tasks (server-side cursor or SQLite fetchmany)
+TASK_STREAM_BATCH_SIZE = int(os.environ.get("TASK_STREAM_BATCH_SIZE", "2000"))
+
+# Sort orders for task pages: sort key -> column compared together with id
+TASK_PAGE_SORTS = {
+    "created": "created_at",
+    "score": "pareto_score",
+}
+
+# Task columns returned by get_tasks, get_task_page and get_cell_tasks
+TASK_COLUMNS = ("id", "name", "description", "impact_score", "urgency_score", "effort_score",
+                "alignment_score", "pareto_score", "status", "due_date", "created_at")
+
+
+# Storage interface used by the app. Rows are dicts like RealDictCursor rows; writes
+# return (success, message) and notify project, task insert and task change listeners.
+# add_task also returns the new task's id (None when nothing was added).
+class Storage(ABC):
+    # Whether the Postgres-only features (server-side summaries, snapshots, COPY import) are available
+    server_side_analysis = False
+
+    @abstractmethod
+    def initialize(self):
+        ...
+
+    @abstractmethod
+    def create_demo_user(self):
+        ...
+
+    @abstractmethod
+    def add_project(self, user_id, name, description=""):
+        ...
+
+    @abstractmethod
+    def add_task(self, project_id, name, description, impact_score, urgency_score, effort_score, alignment_score,
+                 due_date=None, tags=()):
+        ...
+
+    # Tag existing tasks of a project by tag name, creating missing tags
+    @abstractmethod
+    def tag_tasks(self, project_id, task_ids, tag_names):
+        ...
+
+    # Tags used in a project as {"id", "name", "task_count"} rows, ordered by name
+    @abstractmethod
+    def get_project_tags(self, project_id):
+        ...
+
+    # Write a batch of (user_id, activity_type, description, entity_type, entity_id, created_at)
+    # activity_log rows; called by the activity log writer thread, not by request handlers
+    @abstractmethod
+    def log_activities(self, rows):
+        ...
+
+    @abstractmethod
+    def get_projects(self, user_id):
+        ...
+
+    # {"id", "user_id", "name", "is_active"} rows of every user's projects, ordered by id
+    @abstractmethod
+    def get_all_projects(self):
+        ...
+
+    # (impact, urgency, alignment) score weights of a project, or None
+    @abstractmethod
+    def get_project_weights(self, project_id):
+        ...
+
+    # Change a project's score weights and rescore its tasks
+    @abstractmethod
+    def set_project_weights(self, project_id, weights):
+        ...
+
+    # (impact, urgency, alignment, effort, task count) per distinct score combination
+    @abstractmethod
+    def get_score_profiles(self, project_id, tag_id=None):
+        ...
+
+    # Task reads take an optional tag_id; filtered reads only touch the tag's tasks
+    @abstractmethod
+    def get_tasks(self, project_id, tag_id=None):
+        ...
+
+    # (ids int32, impact, urgency, alignment, effort int8) arrays of a project's tasks in get_tasks order;
+    # the analysis path reads these instead of full rows
+    @abstractmethod
+    def get_task_columns(self, project_id, tag_id=None):
+        ...
+
+    # {id: name} of the given tasks of a project
+    @abstractmethod
+    def get_task_names(self, project_id, task_ids):
+        ...
+
+    # (task count, last update time) of a project's tasks
+    @abstractmethod
+    def get_task_version(self, project_id, tag_id=None):
+        ...
+
+    # One keyset page of tasks; returns (rows, next_cursor)
+    @abstractmethod
+    def get_task_page(self, project_id, page_size=50, after=None, sort="created", tag_id=None):
+        ...
+
+    @abstractmethod
+    def get_cell_tasks(self, project_id, effort_score, impact_score, limit=100, tag_id=None):
+        ...
+
+    # (project_id, id, name, impact, urgency, effort, alignment, pareto_score) tuples of all of a user's tasks
+    @abstractmethod
+    def get_portfolio_tasks(self, user_id):
+        ...
+
+
+# PostgreSQL through the shared connection pool in database.py
+class PostgresStorage(Storage):
+    server_side_analysis = True
+
+    # database.py needs psycopg2; the SQLite and memory backends run without it
+    def __init__(self):
+        import database
+        self._database = database
+
+    def initialize(self):
+        from migrations import run_migrations
+        return run_migrations()
+
+    def create_demo_user(self):
+        return self._database.create_demo_user()
+
+    def add_project(self, user_id, name, description=""):
+        return self._database.add_project(user_id, name, description)
+
+    def add_task(self, project_id, name, description, impact_score, urgency_score, effort_score, alignment_score,
+                 due_date=None, tags=()):
+        return self._database.add_task(project_id, name, description, impact_score, urgency_score, effort_score,
+                                       alignment_score, due_date, tags)
+
+    def tag_tasks(self, project_id, task_ids, tag_names):
+        return self._database.tag_tasks(project_id, task_ids, tag_names)
+
+    def get_project_tags(self, project_id):
+        return self._database.get_project_tags(project_id)
+
+    def log_activities(self, rows):
+        return self._database.log_activities(rows)
+
+    def get_projects(self, user_id):
+        return self._database.get_projects(user_id)
+
+    def get_all_projects(self):
+        return self._database.get_all_projects()
+
+    def get_project_weights(self, project_id):
+        return self._database.get_project_weights(project_id)
+
+    def set_project_weights(self, project_id, weights):
+        return self._database.set_project_weights(project_id, weights)
+
+    def get_score_profiles(self, project_id, tag_id=None):
+        return self._database.get_score_profiles(project_id, tag_id)
+
+    def get_tasks(self, project_id, tag_id=None):
+        return self._database.get_tasks(project_id, tag_id)
+
+    def get_task_columns(self, project_id, tag_id=None):
+        return self._database.get_task_columns(project_id, tag_id)
+
+    def get_task_names(self, project_id, task_ids):
+        return self._database.get_task_names(project_id, task_ids)
+
+    def get_task_version(self, project_id, tag_id=None):
+        return self._database.get_task_version(project_id, tag_id)
+
+    def get_task_page(self, project_id, page_size=50, after=None, sort="created", tag_id=None):
+        return self._database.get_task_page(project_id, page_size, after, sort, tag_id)
+
+    def get_cell_tasks(self, project_id, effort_score, impact_score, limit=100, tag_id=None):
+        return self._database.get_cell_tasks(project_id, effort_score, impact_score, limit, tag_id)
+
+    def get_portfolio_tasks(self, user_id):
+        return self._database.get_portfolio_tasks(user_id)
+
+
+# Timestamps are stored as sortable ISO text with millisecond precision
+_SQLITE_NOW = "(strftime('%Y-%m-%d %H:%M:%f', 'now'))"
+
+
+# The tasks table; pareto_score follows the project's weights and is kept by triggers
+def _sqlite_tasks_table(name):
+    return f"""
+CREATE TABLE IF NOT EXISTS {name} (
+    id INTEGER PRIMARY KEY,
+    project_id INTEGER REFERENCES projects(id),
+    name TEXT NOT NULL,
+    description TEXT,
+    impact_score INTEGER NOT NULL CHECK (impact_score BETWEEN 1 AND 10),
+    urgency_score INTEGER NOT NULL CHECK (urgency_score BETWEEN 1 AND 10),
+    effort_score INTEGER NOT NULL CHECK (effort_score BETWEEN 1 AND 10),
+    alignment_score INTEGER NOT NULL CHECK (alignment_score BETWEEN 1 AND 10),
+    status TEXT NOT NULL DEFAULT 'PENDING',
+    due_date TEXT,
+    created_at TEXT NOT NULL DEFAULT {_SQLITE_NOW},
+    updated_at TEXT NOT NULL DEFAULT {_SQLITE_NOW},
+    pareto_score REAL
+);"""
+
+
+_SQLITE_SCORE_FROM_PROJECT = """
+        SELECT (NEW.impact_score * impact_weight + NEW.urgency_score * urgency_weight
+                + NEW.alignment_score * alignment_weight) / NEW.effort_score * 10
+        FROM projects WHERE id = NEW.project_id
+    """
+
+_SQLITE_TASK_COPY_COLUMNS = ("id, project_id, name, description, impact_score, urgency_score, effort_score, "
+                             "alignment_score, status, due_date, created_at, updated_at, pareto_score")
+
+_SQLITE_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    username TEXT UNIQUE NOT NULL,
+    email TEXT UNIQUE NOT NULL,
+    password_hash TEXT NOT NULL,
+    created_at TEXT NOT NULL DEFAULT {_SQLITE_NOW},
+    updated_at TEXT NOT NULL DEFAULT {_SQLITE_NOW}
+);
+
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER REFERENCES users(id),
+    name TEXT NOT NULL,
+    description TEXT,
+    is_active INTEGER NOT NULL DEFAULT 1,
+    created_at TEXT NOT NULL DEFAULT {_SQLITE_NOW},
+    updated_at TEXT NOT NULL DEFAULT {_SQLITE_NOW},
+    impact_weight REAL NOT NULL DEFAULT {IMPACT_WEIGHT},
+    urgency_weight REAL NOT NULL DEFAULT {URGENCY_WEIGHT},
+    alignment_weight REAL NOT NULL DEFAULT {ALIGNMENT_WEIGHT}
+);
+
+{_sqlite_tasks_table("tasks")}
+
+CREATE TABLE IF NOT EXISTS tags (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    color TEXT NOT NULL DEFAULT '#3498db',
+    created_at TEXT NOT NULL DEFAULT {_SQLITE_NOW}
+);
+
+CREATE TABLE IF NOT EXISTS task_tags (
+    id INTEGER PRIMARY KEY,
+    task_id INTEGER REFERENCES tasks(id),
+    tag_id INTEGER REFERENCES tags(id),
+    created_at TEXT NOT NULL DEFAULT {_SQLITE_NOW},
+    UNIQUE(task_id, tag_id)
+);
+
+CREATE TABLE IF NOT EXISTS activity_log (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER REFERENCES users(id),
+    activity_type TEXT NOT NULL,
+    description TEXT NOT NULL,
+    entity_type TEXT NOT NULL,
+    entity_id INTEGER NOT NULL,
+    created_at TEXT NOT NULL DEFAULT {_SQLITE_NOW}
+);
+
+CREATE INDEX IF NOT EXISTS idx_projects_user_id ON projects(user_id);
+CREATE INDEX IF NOT EXISTS idx_activity_log_user_id ON activity_log(user_id);
+CREATE INDEX IF NOT EXISTS idx_task_tags_tag_task ON task_tags(tag_id, task_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_project_created ON tasks(project_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_tasks_project_pareto_score ON tasks(project_id, pareto_score DESC, id DESC);
+
+CREATE TRIGGER IF NOT EXISTS tasks_pareto_score_insert AFTER INSERT ON tasks
+BEGIN
+    UPDATE tasks SET pareto_score = ({_SQLITE_SCORE_FROM_PROJECT}) WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS tasks_pareto_score_update
+AFTER UPDATE OF project_id, impact_score, urgency_score, effort_score, alignment_score ON tasks
+BEGIN
+    UPDATE tasks SET pareto_score = ({_SQLITE_SCORE_FROM_PROJECT}) WHERE id = NEW.id;
+END;
+"""
+
+_SQLITE_TASK_SELECT = f"SELECT {', '.join(TASK_COLUMNS)} FROM tasks"
+
+
+# SQL and parameters restricting a tasks query to one tag; follows the project_id condition
+def _sqlite_tag_filter(tag_id):
+    if tag_id is None:
+        return "", ()
+    return "AND id IN (SELECT task_id FROM task_tags WHERE tag_id = ?)", (tag_id,)
+
+
+# get_task_columns arrays from (id, impact, urgency, alignment, effort) integer rows
+def _task_columns(rows):
+    rows = np.asarray(rows, dtype=np.int32).reshape(-1, 5)
+    return (rows[:, 0].copy(),) + tuple(rows[:, column].astype(np.int8) for column in range(1, 5))
+
+
+# Rows as dicts, with due dates parsed back into date objects
+def _sqlite_row(cursor, row):
+    record = {column[0]: value for column, value in zip(cursor.description, row)}
+    if isinstance(record.get("due_date"), str):
+        record["due_date"] = date.fromisoformat(record["due_date"])
+    return record
+
+
+# Embedded SQLite file in WAL mode: readers never block the single writer.
+# Each thread gets its own connection; statements are fixed strings so sqlite3's
+# per-connection statement cache reuses the prepared statements.
+class SQLiteStorage(Storage):
+    def __init__(self, path=None, busy_timeout=None):
+        self.path = path or SQLITE_PATH
+        self.busy_timeout = SQLITE_BUSY_TIMEOUT if busy_timeout is None else busy_timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, cached_statements=256)
+            conn.row_factory = _sqlite_row
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute("PRAGMA foreign_keys = ON")
+            self._local.conn = conn
+        return conn
+
+    def initialize(self):
+        try:
+            conn = self._connection()
+            self._upgrade_schema(conn)
+            conn.executescript(_SQLITE_SCHEMA)
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"Error creating SQLite tables: {e}")
+            return False
+
+    # Files created before per-project weights have no weight columns and a generated
+    # pareto_score column; add the columns and rebuild tasks with a plain score column
+    def _upgrade_schema(self, conn):
+        task_columns = {row["name"]: row for row in conn.execute("PRAGMA table_xinfo(tasks)").fetchall()}
+        if not task_columns:
+            return
+
+        project_columns = {row["name"] for row in conn.execute("PRAGMA table_info(projects)").fetchall()}
+        for column, default in zip(("impact_weight", "urgency_weight", "alignment_weight"), DEFAULT_WEIGHTS):
+            if column not in project_columns:
+                conn.execute(f"ALTER TABLE projects ADD COLUMN {column} REAL NOT NULL DEFAULT {default}")
+        conn.commit()
+
+        if task_columns["pareto_score"]["hidden"] == 3:  # stored generated column
+            conn.execute("PRAGMA foreign_keys = OFF")
+            conn.executescript(f"""
+                BEGIN;
+                {_sqlite_tasks_table("tasks_rebuilt")}
+                INSERT INTO tasks_rebuilt ({_SQLITE_TASK_COPY_COLUMNS})
+                SELECT {_SQLITE_TASK_COPY_COLUMNS} FROM tasks;
+                DROP TABLE tasks;
+                ALTER TABLE tasks_rebuilt RENAME TO tasks;
+                COMMIT;
+            """)
+            conn.execute("PRAGMA foreign_keys = ON")
+
+    @instrument_query("create_demo_user")
+    def create_demo_user(self):
+        conn = self._connection()
+        try:
+            conn.execute("INSERT OR IGNORE INTO users (username, email, password_hash) VALUES (?, ?, ?)", DEMO_USER)
+            conn.commit()
+            return conn.execute("SELECT id FROM users WHERE username = ?", DEMO_USER[:1]).fetchone()["id"]
+        except sqlite3.Error as e:
+            conn.rollback()
+            print(f"Error creating demo user: {e}")
+            return None
+
+    @instrument_query("add_project")
+    def add_project(self, user_id, name, description=""):
+        conn = self._connection()
+        try:
+            cur = conn.execute(
+                "INSERT INTO projects (user_id, name, description) VALUES (?, ?, ?)", (user_id, name, description)
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            return False, f"Error adding project: {e}"
+        notify_projects_changed(user_id)
+        activity_logger.record(user_id, "CREATE", f"Created project {name}", "project", cur.lastrowid)
+        return True, f"Project added successfully! ID: {cur.lastrowid}"
+
+    @instrument_query("add_task")
+    def add_task(self, project_id, name, description, impact_score, urgency_score, effort_score, alignment_score,
+                 due_date=None, tags=()):
+        conn = self._connection()
+        try:
+            cur = conn.execute("""
+                INSERT INTO tasks (project_id, name, description, impact_score, urgency_score, effort_score,
+                                   alignment_score, due_date)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                RETURNING id, (SELECT user_id FROM projects WHERE id = tasks.project_id) AS user_id
+            """, (project_id, name, description, impact_score, urgency_score, effort_score, alignment_score,
+                  due_date.isoformat() if due_date else None))
+            row = cur.fetchone()
+            task_id = row["id"]
+            if tags:
+                self._attach_tags(conn, [task_id], tags)
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            return False, f"Error adding task: {e}", None
+        notify_task_added(project_id, task_id, impact_score, urgency_score, alignment_score, effort_score)
+        notify_tasks_changed(project_id)
+        activity_logger.record(row["user_id"], "CREATE", f"Created task {name}", "task", task_id)
+        return True, f"Task added successfully! ID: {task_id}", task_id
+
+    # Link every task to every tag, creating missing tags; returns the number of new links
+    def _attach_tags(self, conn, task_ids, tag_names):
+        conn.executemany("INSERT OR IGNORE INTO tags (name) VALUES (?)", [(name,) for name in tag_names])
+        tag_ids = [
+            conn.execute("SELECT id FROM tags WHERE name = ?", (name,)).fetchone()["id"] for name in tag_names
+        ]
+        before = conn.total_changes
+        conn.executemany(
+            "INSERT OR IGNORE INTO task_tags (task_id, tag_id) VALUES (?, ?)",
+            [(task_id, tag_id) for task_id in task_ids for tag_id in tag_ids]
+        )
+        return conn.total_changes - before
+
+    @instrument_query("log_activities")
+    def log_activities(self, rows):
+        conn = self._connection()
+        try:
+            conn.executemany("""
+                INSERT INTO activity_log (user_id, activity_type, description, entity_type, entity_id, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, [(*row[:5], row[5].astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]) for row in rows])
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            return False, f"Error logging activities: {e}"
+        return True, f"Logged {len(rows)} activities"
+
+    @instrument_query("tag_tasks")
+    def tag_tasks(self, project_id, task_ids, tag_names):
+        conn = self._connection()
+        try:
+            found = [
+                row["id"] for row in conn.execute(
+                    f"SELECT id FROM tasks WHERE project_id = ? AND id IN ({', '.join('?' * len(task_ids))})",
+                    (project_id, *task_ids)
+                ).fetchall()
+            ]
+            if not found:
+                return False, "None of these tasks belong to the selected project"
+            added = self._attach_tags(conn, found, tag_names)
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            return False, f"Error tagging tasks: {e}"
+        return True, f"Tagged {len(found)} task(s) with {', '.join(tag_names)} ({added} new tag link(s))"
+
+    @instrument_query("get_project_tags")
+    def get_project_tags(self, project_id):
+        try:
+            return self._connection().execute("""
+                SELECT tg.id, tg.name, COUNT(*) AS task_count
+                FROM task_tags tt
+                JOIN tasks t ON t.id = tt.task_id
+                JOIN tags tg ON tg.id = tt.tag_id
+                WHERE t.project_id = ?
+                GROUP BY tg.id, tg.name
+                ORDER BY tg.name
+            """, (project_id,)).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error retrieving project tags: {e}")
+            return []
+
+    @instrument_query("get_projects")
+    def get_projects(self, user_id):
+        try:
+            rows = self._connection().execute("""
+                SELECT id, name, description, is_active
+                FROM projects
+                WHERE user_id = ?
+                ORDER BY created_at DESC, id DESC
+            """, (user_id,)).fetchall()
+            return [dict(row, is_active=bool(row["is_active"])) for row in rows]
+        except sqlite3.Error as e:
+            print(f"Error retrieving projects: {e}")
+            return []
+
+    @instrument_query("get_all_projects")
+    def get_all_projects(self):
+        try:
+            rows = self._connection().execute(
+                "SELECT id, user_id, name, is_active FROM projects ORDER BY id"
+            ).fetchall()
+            return [dict(row, is_active=bool(row["is_active"])) for row in rows]
+        except sqlite3.Error as e:
+            print(f"Error retrieving projects: {e}")
+            return []
+
+    @instrument_query("get_project_weights")
+    def get_project_weights(self, project_id):
+        try:
+            row = self._connection().execute(
+                "SELECT impact_weight, urgency_weight, alignment_weight FROM projects WHERE id = ?", (project_id,)
+            ).fetchone()
+            return tuple(row.values()) if row else None
+        except sqlite3.Error as e:
+            print(f"Error retrieving project weights: {e}")
+            return None
+
+    @instrument_query("set_project_weights")
+    def set_project_weights(self, project_id, weights):
+        # Bound as REAL so whole-number weights do not turn the score into integer division
+        weights = tuple(float(weight) for weight in weights)
+        conn = self._connection()
+        try:
+            cur = conn.execute(f"""
+                UPDATE projects
+                SET impact_weight = ?, urgency_weight = ?, alignment_weight = ?, updated_at = {_SQLITE_NOW}
+                WHERE id = ?
+            """, (*weights, project_id))
+            if cur.rowcount == 0:
+                conn.rollback()
+                return False, f"Project {project_id} does not exist"
+            cur = conn.execute(f"""
+                UPDATE tasks
+                SET pareto_score = (impact_score * ? + urgency_score * ? + alignment_score * ?) / effort_score * 10,
+                    updated_at = {_SQLITE_NOW}
+                WHERE project_id = ?
+            """, (*weights, project_id))
+            rescored = cur.rowcount
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            return False, f"Error updating weights: {e}"
+        notify_tasks_changed(project_id)
+        return True, f"Weights saved; {rescored} task(s) rescored"
+
+    @instrument_query("get_score_profiles")
+    def get_score_profiles(self, project_id, tag_id=None):
+        tag_filter, tag_params = _sqlite_tag_filter(tag_id)
+        try:
+            rows = self._connection().execute(f"""
+                SELECT impact_score, urgency_score, alignment_score, effort_score, COUNT(*) AS task_count
+                FROM tasks
+                WHERE project_id = ? {tag_filter}
+                GROUP BY impact_score, urgency_score, alignment_score, effort_score
+            """, (project_id, *tag_params)).fetchall()
+            return [tuple(row.values()) for row in rows]
+        except sqlite3.Error as e:
+            print(f"Error retrieving score profiles: {e}")
+            return []
+
+    @instrument_query("get_tasks")
+    def get_tasks(self, project_id, tag_id=None):
+        tag_filter, tag_params = _sqlite_tag_filter(tag_id)
+        try:
+            return self._connection().execute(
+                f"{_SQLITE_TASK_SELECT} WHERE project_id = ? {tag_filter} ORDER BY created_at DESC, id DESC",
+                (project_id, *tag_params)
+            ).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error retrieving tasks: {e}")
+            return []
+
+    # Read as plain tuples in batches, so at most one batch of row objects exists at a time
+    @instrument_query("get_task_columns")
+    def get_task_columns(self, project_id, tag_id=None):
+        tag_filter, tag_params = _sqlite_tag_filter(tag_id)
+        try:
+            cur = self._connection().cursor()
+            cur.row_factory = None
+            cur.execute(
+                "SELECT id, impact_score, urgency_score, alignment_score, effort_score FROM tasks "
+                f"WHERE project_id = ? {tag_filter} ORDER BY created_at DESC, id DESC",
+                (project_id, *tag_params)
+            )
+            batches = []
+            while True:
+                rows = cur.fetchmany(TASK_STREAM_BATCH_SIZE)
+                if not rows:
+                    break
+                batches.append(np.array(rows, dtype=np.int32))
+            return _task_columns(np.concatenate(batches) if batches else [])
+        except sqlite3.Error as e:
+            print(f"Error retrieving task columns: {e}")
+            return _task_columns([])
+
+    @instrument_query("get_task_names")
+    def get_task_names(self, project_id, task_ids):
+        if not len(task_ids):
+            return {}
+        try:
+            cur = self._connection().cursor()
+            cur.row_factory = None
+            cur.execute(
+                "SELECT id, name FROM tasks WHERE project_id = ? AND id IN (SELECT value FROM json_each(?))",
+                (project_id, json.dumps([int(task_id) for task_id in task_ids]))
+            )
+            return dict(cur.fetchall())
+        except sqlite3.Error as e:
+            print(f"Error retrieving task names: {e}")
+            return {}
+
+    @instrument_query("get_task_version")
+    def get_task_version(self, project_id, tag_id=None):
+        tag_filter, tag_params = _sqlite_tag_filter(tag_id)
+        try:
+            row = self._connection().execute(
+                "SELECT COUNT(*) AS task_count, MAX(updated_at) AS updated_at "
+                f"FROM tasks WHERE project_id = ? {tag_filter}",
+                (project_id, *tag_params)
+            ).fetchone()
+            return row["task_count"], row["updated_at"]
+        except sqlite3.Error as e:
+            print(f"Error retrieving task version: {e}")
+            return None
+
+    @instrument_query("get_task_page")
+    def get_task_page(self, project_id, page_size=50, after=None, sort="created", tag_id=None):
+        column = TASK_PAGE_SORTS.get(sort)
+        if column is None:
+            raise ValueError(f"Unknown task sort: {sort}")
+
+        tag_filter, tag_params = _sqlite_tag_filter(tag_id)
+        keyset = ""
+        params = [project_id, *tag_params]
+        if after is not None:
+            keyset = f"AND ({column}, id) < (?, ?)"
+            params.extend(after)
+        params.append(page_size + 1)
+
+        try:
+            rows = self._connection().execute(
+                f"{_SQLITE_TASK_SELECT} WHERE project_id = ? {tag_filter} {keyset} "
+                f"ORDER BY {column} DESC, id DESC LIMIT ?",
+                params
+            ).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error retrieving task page: {e}")
+            return [], None
+
+        if len(rows) <= page_size:
+            return rows, None
+        rows = rows[:page_size]
+        return rows, (rows[-1][column], rows[-1]["id"])
+
+    @instrument_query("get_cell_tasks")
+    def get_cell_tasks(self, project_id, effort_score, impact_score, limit=100, tag_id=None):
+        tag_filter, tag_params = _sqlite_tag_filter(tag_id)
+        try:
+            return self._connection().execute(f"""
+                {_SQLITE_TASK_SELECT}
+                WHERE project_id = ? {tag_filter} AND effort_score = ? AND impact_score = ?
+                ORDER BY pareto_score DESC, id DESC
+                LIMIT ?
+            """, (project_id, *tag_params, effort_score, impact_score, limit)).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error retrieving cell tasks: {e}")
+            return []
+
+    @instrument_query("get_portfolio_tasks")
+    def get_portfolio_tasks(self, user_id):
+        try:
+            rows = self._connection().execute("""
+                SELECT t.project_id, t.id, t.name, t.impact_score, t.urgency_score, t.effort_score, t.alignment_score,
+                       t.pareto_score
+                FROM tasks t
+                JOIN projects p ON p.id = t.project_id
+                WHERE p.user_id = ?
+                ORDER BY t.project_id
+            """, (user_id,)).fetchall()
+            return [tuple(row.values()) for row in rows]
+        except sqlite3.Error as e:
+            print(f"Error retrieving portfolio tasks: {e}")
+            return []
+
+
+# Process-local storage for tests, benchmarks and throwaway demos; nothing is persisted
+class MemoryStorage(Storage):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._users = {}
+        self._projects = []
+        self._tasks = {}  # project id -> task dicts in insertion order
+        self._tags = {}  # tag name -> tag id
+        self._task_tags = {}  # task id -> set of tag ids
+        self._activities = []  # activity_log rows
+        self._next_id = {"user": 1, "project": 1, "task": 1, "tag": 1}
+
+    def _new_id(self, kind):
+        value = self._next_id[kind]
+        self._next_id[kind] += 1
+        return value
+
+    def initialize(self):
+        return True
+
+    @instrument_query("create_demo_user")
+    def create_demo_user(self):
+        with self._lock:
+            username = DEMO_USER[0]
+            if username not in self._users:
+                self._users[username] = self._new_id("user")
+            return self._users[username]
+
+    @instrument_query("add_project")
+    def add_project(self, user_id, name, description=""):
+        with self._lock:
+            project_id = self._new_id("project")
+            self._projects.append({
+                "id": project_id, "user_id": user_id, "name": name, "description": description,
+                "is_active": True, "created_at": datetime.now(), "weights": DEFAULT_WEIGHTS,
+            })
+            self._tasks[project_id] = []
+        notify_projects_changed(user_id)
+        activity_logger.record(user_id, "CREATE", f"Created project {name}", "project", project_id)
+        return True, f"Project added successfully! ID: {project_id}"
+
+    @instrument_query("add_task")
+    def add_task(self, project_id, name, description, impact_score, urgency_score, effort_score, alignment_score,
+                 due_date=None, tags=()):
+        for score in (impact_score, urgency_score, effort_score, alignment_score):
+            if not 1 <= score <= 10:
+                return False, "Error adding task: scores must be between 1 and 10", None
+
+        with self._lock:
+            if project_id not in self._tasks:
+                return False, f"Error adding task: project {project_id} does not exist", None
+            weights = self._project(project_id)["weights"]
+            now = datetime.now()
+            task_id = self._new_id("task")
+            self._tasks[project_id].append({
+                "id": task_id, "name": name, "description": description,
+                "impact_score": impact_score, "urgency_score": urgency_score,
+                "effort_score": effort_score, "alignment_score": alignment_score,
+                "pareto_score": calculate_pareto_score(impact_score, urgency_score, alignment_score, effort_score,
+                                                       weights),
+                "status": "PENDING", "due_date": due_date, "created_at": now, "updated_at": now,
+            })
+            if tags:
+                self._attach_tags([task_id], tags)
+            user_id = self._project(project_id)["user_id"]
+        notify_task_added(project_id, task_id, impact_score, urgency_score, alignment_score, effort_score)
+        notify_tasks_changed(project_id)
+        activity_logger.record(user_id, "CREATE", f"Created task {name}", "task", task_id)
+        return True, f"Task added successfully! ID: {task_id}", task_id
+
+    # Called with the lock held; returns the number of new links
+    def _attach_tags(self, task_ids, tag_names):
+        for name in tag_names:
+            if name not in self._tags:
+                self._tags[name] = self._new_id("tag")
+        added = 0
+        for task_id in task_ids:
+            linked = self._task_tags.setdefault(task_id, set())
+            for name in tag_names:
+                if self._tags[name] not in linked:
+                    linked.add(self._tags[name])
+                    added += 1
+        return added
+
+    @instrument_query("log_activities")
+    def log_activities(self, rows):
+        with self._lock:
+            self._activities.extend(rows)
+        return True, f"Logged {len(rows)} activities"
+
+    @instrument_query("tag_tasks")
+    def tag_tasks(self, project_id, task_ids, tag_names):
+        with self._lock:
+            project_task_ids = {t["id"] for t in self._tasks.get(project_id, ())}
+            found = [task_id for task_id in task_ids if task_id in project_task_ids]
+            if not found:
+                return False, "None of these tasks belong to the selected project"
+            added = self._attach_tags(found, tag_names)
+        return True, f"Tagged {len(found)} task(s) with {', '.join(tag_names)} ({added} new tag link(s))"
+
+    @instrument_query("get_project_tags")
+    def get_project_tags(self, project_id):
+        with self._lock:
+            names = {tag_id: name for name, tag_id in self._tags.items()}
+            counts = {}
+            for t in self._tasks.get(project_id, ()):
+                for tag_id in self._task_tags.get(t["id"], ()):
+                    counts[tag_id] = counts.get(tag_id, 0) + 1
+        rows = [{"id": tag_id, "name": names[tag_id], "task_count": count} for tag_id, count in counts.items()]
+        return sorted(rows, key=lambda row: row["name"])
+
+    @instrument_query("get_projects")
+    def get_projects(self, user_id):
+        with self._lock:
+            projects = [p for p in self._projects if p["user_id"] == user_id]
+        return [
+            {key: p[key] for key in ("id", "name", "description", "is_active")}
+            for p in reversed(projects)
+        ]
+
+    @instrument_query("get_all_projects")
+    def get_all_projects(self):
+        with self._lock:
+            return [{key: p[key] for key in ("id", "user_id", "name", "is_active")} for p in self._projects]
+
+    # Called with the lock held
+    def _project(self, project_id):
+        return next(p for p in self._projects if p["id"] == project_id)
+
+    @instrument_query("get_project_weights")
+    def get_project_weights(self, project_id):
+        with self._lock:
+            if project_id not in self._tasks:
+                return None
+            return self._project(project_id)["weights"]
+
+    @instrument_query("set_project_weights")
+    def set_project_weights(self, project_id, weights):
+        with self._lock:
+            if project_id not in self._tasks:
+                return False, f"Project {project_id} does not exist"
+            self._project(project_id)["weights"] = tuple(weights)
+            now = datetime.now()
+            # Tasks are replaced rather than changed in place, so rows handed out earlier stay as they were
+            self._tasks[project_id] = [
+                dict(t, updated_at=now, pareto_score=calculate_pareto_score(
+                    t["impact_score"], t["urgency_score"], t["alignment_score"], t["effort_score"], weights
+                ))
+                for t in self._tasks[project_id]
+            ]
+            rescored = len(self._tasks[project_id])
+        notify_tasks_changed(project_id)
+        return True, f"Weights saved; {rescored} task(s) rescored"
+
+    @instrument_query("get_score_profiles")
+    def get_score_profiles(self, project_id, tag_id=None):
+        counts = {}
+        for t in self._project_tasks(project_id, tag_id):
+            key = (t["impact_score"], t["urgency_score"], t["alignment_score"], t["effort_score"])
+            counts[key] = counts.get(key, 0) + 1
+        return [(*key, count) for key, count in counts.items()]
+
+    def _project_tasks(self, project_id, tag_id=None):
+        with self._lock:
+            tasks = self._tasks.get(project_id, ())
+            if tag_id is None:
+                return list(tasks)
+            return [t for t in tasks if tag_id in self._task_tags.get(t["id"], ())]
+
+    @instrument_query("get_tasks")
+    def get_tasks(self, project_id, tag_id=None):
+        return [{key: t[key] for key in TASK_COLUMNS} for t in reversed(self._project_tasks(project_id, tag_id))]
+
+    @instrument_query("get_task_columns")
+    def get_task_columns(self, project_id, tag_id=None):
+        return _task_columns([
+            (t["id"], t["impact_score"], t["urgency_score"], t["alignment_score"], t["effort_score"])
+            for t in reversed(self._project_tasks(project_id, tag_id))
+        ])
+
+    @instrument_query("get_task_names")
+    def get_task_names(self, project_id, task_ids):
+        wanted = {int(task_id) for task_id in task_ids}
+        return {t["id"]: t["name"] for t in self._project_tasks(project_id) if t["id"] in wanted}
+
+    @instrument_query("get_task_version")
+    def get_task_version(self, project_id, tag_id=None):
+        tasks = self._project_tasks(project_id, tag_id)
+        return len(tasks), max((t["updated_at"] for t in tasks), default=None)
+
+    @instrument_query("get_task_page")
+    def get_task_page(self, project_id, page_size=50, after=None, sort="created", tag_id=None):
+        column = TASK_PAGE_SORTS.get(sort)
+        if column is None:
+            raise ValueError(f"Unknown task sort: {sort}")
+
+        tasks = sorted(self._project_tasks(project_id, tag_id), key=lambda t: (t[column], t["id"]), reverse=True)
+        if after is not None:
+            after = tuple(after)
+            tasks = [t for t in tasks if (t[column], t["id"]) < after]
+
+        rows = [{key: t[key] for key in TASK_COLUMNS} for t in tasks[:page_size]]
+        if len(tasks) <= page_size:
+            return rows, None
+        return rows, (rows[-1][column], rows[-1]["id"])
+
+    @instrument_query("get_cell_tasks")
+    def get_cell_tasks(self, project_id, effort_score, impact_score, limit=100, tag_id=None):
+        tasks = [
+            t for t in self._project_tasks(project_id, tag_id)
+            if t["effort_score"] == effort_score and t["impact_score"] == impact_score
+        ]
+        tasks.sort(key=lambda t: (t["pareto_score"], t["id"]), reverse=True)
+        return [{key: t[key] for key in TASK_COLUMNS} for t in tasks[:limit]]
+
+    @instrument_query("get_portfolio_tasks")
+    def get_portfolio_tasks(self, user_id):
+        with self._lock:
+            project_ids = sorted(p["id"] for p in self._projects if p["user_id"] == user_id)
+            return [
+                (project_id, t["id"], t["name"], t["impact_score"], t["urgency_score"],
+                 t["effort_score"], t["alignment_score"], t["pareto_score"])
+                for project_id in project_ids
+                for t in self._tasks[project_id]
+            ]
+
+
+_STORAGE_BACKENDS = {
+    "postgres": PostgresStorage,
+    "sqlite": SQLiteStorage,
+    "memory": MemoryStorage,
+}
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+# Shared storage for the configured backend, created on first use
+def get_storage():
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                backend = _STORAGE_BACKENDS.get(STORAGE_BACKEND)
+                if backend is None:
+                    raise ValueError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND}")
+                _storage = backend()
+    return _storage
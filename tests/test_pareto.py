@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from pareto import SCORE_LEVELS, analyze_arrays, front_layers
+
+
+# Naive O(n^2) non-dominated sorting: peel off the tasks no remaining task dominates
+def brute_force_layers(impact, urgency, alignment, effort):
+    # Higher is better on every column (effort is negated)
+    points = np.column_stack([impact, urgency, alignment, -np.asarray(effort)])
+    layers = np.zeros(len(points), dtype=np.int64)
+    remaining = list(range(len(points)))
+    layer = 0
+    while remaining:
+        layer += 1
+        front = [
+            i for i in remaining
+            if not any(np.all(points[j] >= points[i]) and np.any(points[j] > points[i]) for j in remaining)
+        ]
+        layers[front] = layer
+        remaining = [i for i in remaining if i not in front]
+    return layers
+
+
+@pytest.mark.parametrize("seed", range(8))
+@pytest.mark.parametrize("size,low,high", [(60, 1, SCORE_LEVELS), (150, 1, SCORE_LEVELS), (80, 4, 6)])
+def test_front_layers_match_brute_force(seed, size, low, high):
+    # The narrow 4..6 range forces many tied and duplicate score combinations
+    rng = np.random.default_rng(seed)
+    impact, urgency, alignment, effort = rng.integers(low, high + 1, size=(4, size))
+    np.testing.assert_array_equal(
+        front_layers(impact, urgency, alignment, effort),
+        brute_force_layers(impact, urgency, alignment, effort),
+    )
+
+
+def test_front_layers_all_equal():
+    scores = np.full(25, 7)
+    np.testing.assert_array_equal(front_layers(scores, scores, scores, scores), np.ones(25, dtype=np.int64))
+
+
+def test_front_layers_chain():
+    # Each task is strictly better than the next on every score
+    impact = np.arange(SCORE_LEVELS, 0, -1)
+    effort = np.arange(1, SCORE_LEVELS + 1)
+    np.testing.assert_array_equal(
+        front_layers(impact, impact, impact, effort), np.arange(1, SCORE_LEVELS + 1)
+    )
+
+
+def test_front_layers_grid_corners():
+    # The best and worst corners of the grid, plus a task worse only on effort
+    impact = np.array([SCORE_LEVELS, 1, SCORE_LEVELS])
+    effort = np.array([1, SCORE_LEVELS, 2])
+    np.testing.assert_array_equal(front_layers(impact, impact, impact, effort), [1, 3, 2])
+
+
+def test_analyze_arrays_breaks_ties_newest_first():
+    # Same order as the SQL rankings (pareto_score DESC, id DESC), whatever the input order
+    ids = np.array([3, 7, 5, 1, 9])
+    scores = np.array([[5, 5, 5, 5, 9], [5, 5, 5, 5, 9], [5, 5, 5, 5, 9], [5, 5, 5, 5, 1]])
+    result = analyze_arrays(ids, ids.astype(str), *scores)
+    assert result.ids.tolist() == [9, 7, 5, 3, 1]
@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+from pareto import analyze_arrays
+from ranking import RankingIndex, RankingIndexes
+
+
+def task_names(ids):
+    return {task_id: f"Task {task_id}" for task_id in ids}
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("low,high", [(1, 10), (4, 6)])
+def test_summary_matches_analyze_arrays_after_inserts(seed, low, high):
+    # Built from part of the tasks, then the rest counted one insert at a time
+    rng = np.random.default_rng(seed)
+    size = 1200
+    ids = np.arange(1, size + 1)
+    impact, urgency, alignment, effort = rng.integers(low, high + 1, size=(4, size))
+    built = 800
+    index = RankingIndex(ids[:built], impact[:built], urgency[:built], alignment[:built], effort[:built],
+                         top_k=300, quadrant_top_k=5)
+    for i in range(built, size):
+        assert index.add(int(ids[i]), int(impact[i]), int(urgency[i]), int(alignment[i]), int(effort[i]))
+
+    names = np.array([f"Task {task_id}" for task_id in ids], dtype=object)
+    result = analyze_arrays(ids, names, impact, urgency, alignment, effort)
+    summary = index.summary(task_names)
+
+    assert len(index) == summary.total_tasks == size
+    assert summary.vital_count == index.cutoff() == result.cutoff
+    assert summary.total_score == pytest.approx(result.total_score)
+    rows = min(result.cutoff, 300)
+    np.testing.assert_array_equal(summary.top.ids, result.ids[:rows])
+    np.testing.assert_allclose(summary.top.cumulative_percentage, result.cumulative_percentage[:rows])
+    np.testing.assert_allclose(summary.curve_percentage, result.cumulative_percentage[summary.curve_rank - 1])
+    np.testing.assert_array_equal(summary.quadrant_counts, result.quadrant_counts)
+    for quadrant, leaders in summary.quadrant_top.items():
+        positions = result.quadrant_positions(quadrant)[:5]
+        assert [name for name, _ in leaders] == result.names[positions].tolist()
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_summary_matches_analyze_arrays_after_removals_and_rescores(seed):
+    rng = np.random.default_rng(seed)
+    size = 1200
+    ids = rng.permutation(size) + 1
+    scores = rng.integers(1, 11, size=(4, size))
+    index = RankingIndex(ids, *scores, top_k=300, quadrant_top_k=5)
+    removed = rng.choice(size, 150, replace=False)
+    for i in removed:
+        assert index.remove(int(ids[i]))
+    assert not index.remove(int(ids[removed[0]]))
+    kept = np.setdiff1d(np.arange(size), removed)
+    for i in rng.choice(kept, 150, replace=False):
+        scores[:, i] = rng.integers(1, 11, size=4)
+        assert index.update(int(ids[i]), *scores[:, i].tolist())
+
+    ids, scores = ids[kept], scores[:, kept]
+    names = np.array([f"Task {task_id}" for task_id in ids], dtype=object)
+    result = analyze_arrays(ids, names, *scores)
+    summary = index.summary(task_names)
+
+    assert len(index) == summary.total_tasks == len(kept)
+    assert summary.vital_count == result.cutoff
+    assert summary.total_score == pytest.approx(result.total_score)
+    np.testing.assert_allclose(summary.curve_percentage, result.cumulative_percentage[summary.curve_rank - 1])
+    np.testing.assert_array_equal(summary.quadrant_counts, result.quadrant_counts)
+    # Removed or demoted leaders shorten the kept lists, which stay the best tasks
+    rows = len(summary.top.ids)
+    assert rows <= min(result.cutoff, 300)
+    if index.complete():
+        assert rows == min(result.cutoff, 300)
+    np.testing.assert_array_equal(summary.top.ids, result.ids[:rows])
+    for quadrant, leaders in summary.quadrant_top.items():
+        positions = result.quadrant_positions(quadrant)[:len(leaders)]
+        assert [name for name, _ in leaders] == result.names[positions].tolist()
+
+
+def test_removing_a_kept_task_leaves_the_index_for_a_rebuild():
+    indexes = RankingIndexes()
+    columns = (np.array([3, 1, 2]), np.array([9, 5, 5]), np.array([9, 5, 5]), np.array([9, 5, 5]),
+               np.array([1, 5, 5]))
+    index = indexes.build(7, columns, None)
+    # Ids need not arrive in order
+    assert index.includes(2) and not index.includes(4)
+    assert index.add(0, 5, 5, 5, 5) and index.includes(0)
+
+    indexes.task_updated(7, 1, 6, 5, 5, 5)
+    assert index.rank(6, 5, 5, 5) == 2 and index.complete()
+    assert indexes.get(7, (4, None), None) is index
+
+    indexes.task_removed(7, 3)
+    assert not index.includes(3) and len(index) == 3
+    assert index.complete()
+    assert indexes.stats()["updates"] == 2
+
+    small = RankingIndex([1, 2, 3], [9, 5, 5], [9, 5, 5], [9, 5, 5], [1, 5, 5], top_k=2)
+    assert small.remove(1) and not small.complete()
+
+
+def test_rank_of_new_task_counts_ties_newest_first():
+    index = RankingIndex([1, 2, 3], [5, 9, 5], [5, 9, 5], [5, 9, 5], [5, 1, 5])
+    assert index.add(4, 5, 5, 5, 5)
+    assert index.rank(5, 5, 5, 5) == 2
+    assert index.score(5, 5, 5, 5) == pytest.approx(10.0)
+    # Notifications for tasks the build already read are not counted twice
+    assert not index.add(2, 9, 9, 9, 1)
+    assert len(index) == 4 and index.includes(3) and not index.includes(5)
+
+
+def test_indexes_only_serve_matching_versions():
+    indexes = RankingIndexes(max_projects=1)
+    columns = (np.array([1, 2]), np.array([3, 4]), np.array([3, 4]), np.array([3, 4]), np.array([2, 2]))
+    index = indexes.build(7, columns, None)
+    assert indexes.get(7, (2, None), None) is index
+    assert indexes.get(7, (3, None), None) is None
+    assert indexes.get(7, (2, None), (0.5, 0.25, 0.25)) is None
+
+    indexes.task_added(7, 3, 5, 5, 5, 5)
+    assert indexes.get(7, (3, None), None) is index
+    assert indexes.stats()["updates"] == 1
+
+    indexes.build(8, columns, None)
+    assert indexes.peek(7) is None
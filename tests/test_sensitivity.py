@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from pareto import PARETO_THRESHOLD, score_arrays
+from sensitivity import weight_sensitivity
+
+
+# Ranks and vital-few shares of every task under one weight vector, from a plain sort.
+# Tied tasks share the rank of the first of them, and split the vital-few places
+# left at the cutoff between them.
+def brute_force_ranking(impact, urgency, alignment, effort, weights):
+    scores = np.round(score_arrays(impact, urgency, alignment, effort, weights), 9)
+    ordered = np.sort(scores)[::-1]
+    cumulative = np.cumsum(ordered) / ordered.sum() * 100
+    cutoff = max(int(np.searchsorted(cumulative, PARETO_THRESHOLD, side="right")), 1)
+
+    ranks = np.array([1 + np.count_nonzero(scores > score) for score in scores])
+    tied = np.array([np.count_nonzero(scores == score) for score in scores])
+    vital = np.clip(cutoff - (ranks - 1), 0, tied) / tied
+    return ranks, vital
+
+
+@pytest.fixture(params=[(0, 1, 10, 300), (1, 3, 7, 200), (2, 1, 10, 40)])
+def tasks(request):
+    # The narrow 3..7 range produces many tied scores
+    seed, low, high, size = request.param
+    return np.random.default_rng(seed).integers(low, high + 1, size=(4, size))
+
+
+def test_weight_sensitivity_matches_brute_force(tasks):
+    result = weight_sensitivity(*tasks, base_weights=(0.5, 0.2, 0.3), samples=6, seed=3)
+
+    rankings = [brute_force_ranking(*tasks, tuple(weights)) for weights in result.weights]
+    ranks = np.array([ranking[0] for ranking in rankings], dtype=np.float64)
+    vital = np.array([ranking[1] for ranking in rankings])
+
+    np.testing.assert_array_equal(result.base_rank, rankings[0][0])
+    np.testing.assert_allclose(result.mean_rank, ranks.mean(axis=0))
+    np.testing.assert_allclose(result.rank_std, ranks.std(axis=0), atol=1e-6)
+    np.testing.assert_allclose(result.vital_frequency, vital.mean(axis=0), atol=1e-9)
+
+
+def test_weight_sensitivity_counts_match_expanded_tasks(tasks):
+    # One row per score combination with its task count ranks like the tasks themselves
+    combinations, inverse, counts = np.unique(tasks.T, axis=0, return_inverse=True, return_counts=True)
+    grouped = weight_sensitivity(*combinations.T, counts=counts, samples=5)
+    expanded = weight_sensitivity(*tasks, samples=5)
+
+    inverse = inverse.reshape(-1)
+    np.testing.assert_array_equal(grouped.base_rank[inverse], expanded.base_rank)
+    np.testing.assert_allclose(grouped.mean_rank[inverse], expanded.mean_rank)
+    np.testing.assert_allclose(grouped.vital_frequency[inverse], expanded.vital_frequency, atol=1e-9)
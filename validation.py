@@ -0,0 +1,108 @@
+import datetime
+
+# Task field constraints, matching the CHECK constraints on the tasks table
+SCORE_MIN = 1
+SCORE_MAX = 10
+DUE_DATE_FORMAT = "%Y-%m-%d"
+TASK_NAME_MAX_LENGTH = 255
+TASK_STATUS_MAX_LENGTH = 50
+TAG_NAME_MAX_LENGTH = 50
+SCORE_FIELDS = ("impact_score", "urgency_score", "effort_score", "alignment_score")
+
+
+# Parse an optional YYYY-MM-DD due date; raises ValueError on a bad format
+def parse_due_date(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime.date):
+        return value
+    value = str(value).strip()
+    if value == "":
+        return None
+    return datetime.datetime.strptime(value, DUE_DATE_FORMAT).date()
+
+
+# Parse a 1-10 score; raises ValueError when missing or out of range
+def parse_score(field, value):
+    try:
+        score = int(value)
+        if isinstance(value, float) and value != score:
+            raise ValueError
+        if isinstance(value, str) and value.strip() != str(score):
+            raise ValueError
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be an integer between {SCORE_MIN} and {SCORE_MAX}, got {value!r}")
+
+    if not SCORE_MIN <= score <= SCORE_MAX:
+        raise ValueError(f"{field} must be between {SCORE_MIN} and {SCORE_MAX}, got {score}")
+    return score
+
+
+# Parse comma-separated tag names, dropping blanks and duplicates; raises ValueError on a too-long name
+def parse_tags(value):
+    tags = []
+    for name in str(value or "").split(","):
+        name = name.strip()
+        if name == "" or name in tags:
+            continue
+        if len(name) > TAG_NAME_MAX_LENGTH:
+            raise ValueError(f"Tag {name!r} is longer than {TAG_NAME_MAX_LENGTH} characters")
+        tags.append(name)
+    return tags
+
+
+# Parse comma-separated task IDs; raises ValueError on anything that is not a positive integer
+def parse_task_ids(value):
+    ids = []
+    for item in str(value or "").split(","):
+        item = item.strip()
+        if item == "":
+            continue
+        if not item.isdigit() or int(item) < 1:
+            raise ValueError(f"Invalid task ID: {item!r}")
+        if int(item) not in ids:
+            ids.append(int(item))
+    return ids
+
+
+# Parse (impact, urgency, alignment) score weights and scale them to sum to 1;
+# raises ValueError on a negative or non-numeric weight or when all are zero
+def parse_weights(impact, urgency, alignment):
+    weights = []
+    for field, value in (("Impact weight", impact), ("Urgency weight", urgency), ("Alignment weight", alignment)):
+        try:
+            weight = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{field} must be a number, got {value!r}")
+        if not weight >= 0 or weight == float("inf"):
+            raise ValueError(f"{field} must be zero or positive, got {value!r}")
+        weights.append(weight)
+
+    total = sum(weights)
+    if total == 0:
+        raise ValueError("At least one weight must be positive")
+    return tuple(round(weight / total, 6) for weight in weights)
+
+
+# Validate a task given as a mapping of column name -> raw value
+# Returns (name, description, impact, urgency, effort, alignment, status, due_date)
+def validate_task_fields(row):
+    name = str(row.get("name") or "").strip()
+    if name == "":
+        raise ValueError("Task name cannot be empty!")
+    if len(name) > TASK_NAME_MAX_LENGTH:
+        raise ValueError(f"Task name is longer than {TASK_NAME_MAX_LENGTH} characters")
+
+    scores = [parse_score(field, row.get(field)) for field in SCORE_FIELDS]
+
+    status = str(row.get("status") or "").strip() or "PENDING"
+    if len(status) > TASK_STATUS_MAX_LENGTH:
+        raise ValueError(f"Status is longer than {TASK_STATUS_MAX_LENGTH} characters")
+
+    try:
+        due_date = parse_due_date(row.get("due_date"))
+    except ValueError:
+        raise ValueError("Invalid date format! Please use YYYY-MM-DD format.")
+
+    description = str(row.get("description") or "")
+    return (name, description, *scores, status, due_date)